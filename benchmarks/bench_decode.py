@@ -0,0 +1,39 @@
+"""Decode time per frame for each available JSON backend.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_decode
+"""
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from custom_components.amber_websocket.decoder import DECODERS
+
+from .payloads import encoded_payload
+
+# Forecast intervals per channel: current only, 1 hour, 4 hours, 24 hours.
+FORECAST_SIZES = (0, 12, 48, 288)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'backend':>8} {'frame':>8} {'bytes':>9} {'us/frame':>10}")
+    for forecasts in FORECAST_SIZES:
+        text = encoded_payload(forecasts=forecasts)
+        raw = text.encode()
+        frames = {"text": text, "binary": raw, "view": memoryview(raw)}
+        for name, decoder in DECODERS.items():
+            for kind, frame in frames.items():
+                best = min(
+                    timeit.repeat(lambda: decoder.loads(frame), number=args.frames, repeat=5)
+                )
+                print(f"{name:>8} {kind:>8} {len(raw):>9} {best / args.frames * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Per-frame CPU cost of the coordinator and sensors with debug logging off and on.
+
+Applies synthetic frames straight to ``AmberCoordinator`` with every price
+sensor attached, first with the integration's logger at INFO, then at DEBUG
+(formatted into a handler writing to ``os.devnull``), then with the sampled
+and on-change payload traces. Run from the repository root with Home
+Assistant installed::
+
+    python -m benchmarks.bench_logging
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import timeit
+from types import SimpleNamespace
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.amber_websocket.const import (
+    CONF_SITE_ID,
+    EVENT_MODE_OFF,
+    PAYLOAD_TRACE_CHANGES,
+    PAYLOAD_TRACE_OFF,
+    PAYLOAD_TRACE_SAMPLED,
+)
+from custom_components.amber_websocket.coordinator import AmberCoordinator
+from custom_components.amber_websocket.sensor import SENSOR_DESCRIPTIONS, AmberPriceSensor
+
+from .payloads import SITE_ID, price_payload
+
+PACKAGE_LOGGER = "custom_components.amber_websocket"
+
+
+class QuietSensor(AmberPriceSensor):
+    """Skip the state machine write so only the update path is timed."""
+
+    def async_write_ha_state(self) -> None:
+        pass
+
+
+class _NoClient:
+    def add_listener(self, site_id, callback):
+        return lambda: None
+
+    def add_status_listener(self, callback):
+        return lambda: None
+
+
+async def _run(args: argparse.Namespace, config_dir: str) -> None:
+    hass = HomeAssistant(config_dir)
+    coordinator = AmberCoordinator(hass, _NoClient(), SITE_ID, event_mode=EVENT_MODE_OFF)
+    entry = SimpleNamespace(entry_id="bench", data={CONF_SITE_ID: SITE_ID}, options={})
+    for description in SENSOR_DESCRIPTIONS:
+        sensor = QuietSensor(coordinator, entry, description)
+        sensor.entity_id = f"sensor.{description.key}"
+        await sensor.async_added_to_hass()
+    # Every frame moves the price, so each one changes fields and writes sensors.
+    payloads = [price_payload(sequence) for sequence in range(args.frames)]
+
+    def _apply() -> None:
+        for payload in payloads:
+            coordinator._handle_payload(payload)  # pylint: disable=protected-access
+
+    # Fill the rolling history first so every scenario sees the same steady state.
+    _apply()
+    logger = logging.getLogger(PACKAGE_LOGGER)
+    logger.propagate = False
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        logger.addHandler(logging.StreamHandler(devnull))
+        scenarios = (
+            ("debug off", logging.INFO, PAYLOAD_TRACE_OFF),
+            ("debug on", logging.DEBUG, PAYLOAD_TRACE_OFF),
+            (f"trace 1/{args.trace_every}", logging.INFO, PAYLOAD_TRACE_SAMPLED),
+            ("trace changes", logging.INFO, PAYLOAD_TRACE_CHANGES),
+        )
+        print(f"{len(SENSOR_DESCRIPTIONS)} sensors, 3 channels, {args.frames} frames")
+        for name, level, trace in scenarios:
+            logger.setLevel(level)
+            coordinator.set_trace(trace, args.trace_every)
+            best = min(timeit.repeat(_apply, number=1, repeat=5))
+            print(f"{name:>14}: {best / args.frames * 1e6:8.2f} us/frame")
+    await hass.async_stop(force=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--trace-every", type=int, default=100)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as config_dir:
+        asyncio.run(_run(args, config_dir))
+
+
+if __name__ == "__main__":
+    main()
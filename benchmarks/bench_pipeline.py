@@ -0,0 +1,146 @@
+"""End-to-end latency, throughput and memory benchmark against the mock server.
+
+Drives AmberWebsocketClient -> AmberCoordinator -> AmberPriceSensor over a real
+local WebSocket. Sensor state writes are recorded instead of hitting the state
+machine, so the numbers cover this integration's pipeline only. The unthrottled
+run's applied frames/s is the highest rate the pipeline sustains. Run from the
+repository root with Home Assistant installed::
+
+    python -m benchmarks.bench_pipeline
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+from aiohttp import ClientSession
+from homeassistant.core import HomeAssistant
+
+from custom_components.amber_websocket.const import CONF_SITE_ID
+from custom_components.amber_websocket.coordinator import AmberCoordinator
+from custom_components.amber_websocket.sensor import SENSOR_DESCRIPTIONS, AmberPriceSensor
+from custom_components.amber_websocket.websocket_client import AmberWebsocketClient
+
+from .mock_server import SENT_AT_KEY, MockAmberServer
+from .payloads import SITE_ID
+
+
+class RecordingSensor(AmberPriceSensor):
+    """Record frame-to-write latency instead of writing to the state machine."""
+
+    latencies_ns: list[int] = []
+
+    def async_write_ha_state(self) -> None:
+        payload = self._coordinator.last_price_payload()
+        if payload is not None and SENT_AT_KEY in payload:
+            self.latencies_ns.append(time.perf_counter_ns() - payload[SENT_AT_KEY])
+
+
+def _percentile(values: list[int], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index] / 1e6
+
+
+async def _run_scenario(hass: HomeAssistant, server: MockAmberServer, frames: int) -> dict:
+    await server.start()
+    processed = 0
+    done = asyncio.Event()
+
+    async with ClientSession() as session:
+        client = AmberWebsocketClient(
+            "bench-token",
+            session=session,
+            ws_url=server.url,
+            create_task=hass.async_create_task,
+        )
+        coordinator = AmberCoordinator(hass, client, SITE_ID)
+        entry = SimpleNamespace(entry_id="bench", data={CONF_SITE_ID: SITE_ID}, options={})
+        sensors = [RecordingSensor(coordinator, entry, desc) for desc in SENSOR_DESCRIPTIONS]
+        for sensor in sensors:
+            await sensor.async_added_to_hass()
+
+        def _count() -> None:
+            nonlocal processed
+            processed += 1
+            if processed >= frames:
+                done.set()
+
+        coordinator.async_add_listener(_count)
+        RecordingSensor.latencies_ns.clear()
+
+        tracemalloc.start()
+        baseline = tracemalloc.take_snapshot()
+        started = time.perf_counter()
+        await client.async_subscribe(SITE_ID)
+        await asyncio.wait_for(done.wait(), timeout=max(60, frames))
+        elapsed = time.perf_counter() - started
+        growth = sum(
+            stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(baseline, "filename")
+        )
+        tracemalloc.stop()
+
+        await client.async_stop()
+    await server.stop()
+
+    latencies = RecordingSensor.latencies_ns
+    return {
+        "frames": processed,
+        "received": client.metrics.frames_received,
+        "coalesced": client.metrics.coalesced_frames,
+        "writes": len(latencies),
+        # Coalesced frames were received but never applied, so only applied frames
+        # count towards the sustainable rate.
+        "fps": processed / elapsed,
+        "p50": _percentile(latencies, 50),
+        "p95": _percentile(latencies, 95),
+        "p99": _percentile(latencies, 99),
+        "max": max(latencies) / 1e6,
+        "mem_kib": growth / 1024,
+        "written": coordinator.updates_written,
+        "skipped": coordinator.updates_skipped,
+        "reconnects": server.connections - 1,
+    }
+
+
+def _report(name: str, result: dict) -> None:
+    print(
+        f"{name:>12}: {result['received']} frames received, {result['coalesced']} coalesced, "
+        f"{result['frames']} applied, {result['fps']:.0f} applied frames/s, "
+        f"latency p50 {result['p50']:.3f} ms p95 {result['p95']:.3f} ms "
+        f"p99 {result['p99']:.3f} ms max {result['max']:.3f} ms, "
+        f"writes {result['written']} skipped {result['skipped']}, "
+        f"reconnects {result['reconnects']}, memory {result['mem_kib']:+.1f} KiB"
+    )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        paced = MockAmberServer(rate=args.rate, forecasts=args.forecasts)
+        _report("paced", await _run_scenario(hass, paced, args.paced_frames))
+        flood = MockAmberServer(rate=0, forecasts=args.forecasts)
+        _report("unthrottled", await _run_scenario(hass, flood, args.frames))
+        if args.disconnect_every:
+            flaky = MockAmberServer(
+                rate=0, forecasts=args.forecasts, disconnect_every=args.disconnect_every
+            )
+            _report("disconnects", await _run_scenario(hass, flaky, args.frames))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=5000, help="frames for the unthrottled run")
+    parser.add_argument("--paced-frames", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=50, help="frames per second for the paced run")
+    parser.add_argument("--forecasts", type=int, default=0)
+    parser.add_argument("--disconnect-every", type=int, default=None)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
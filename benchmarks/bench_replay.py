@@ -0,0 +1,118 @@
+"""Replay a frame capture through the client, coordinator and sensors offline.
+
+Feeds a capture written by the ``amber_websocket.start_capture`` service (or a
+synthetic one when no path is given) through ``AmberWebsocketClient`` at max
+speed or at a multiple of real time, and reports CPU time per frame. Pass
+``--profile`` to print the hottest functions. Run from the repository root
+with Home Assistant installed::
+
+    python -m benchmarks.bench_replay --capture amber_websocket_capture.jsonl --profile
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import cProfile
+import os
+import pstats
+import tempfile
+import time
+from types import SimpleNamespace
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.amber_websocket.capture import (
+    RECORD_CONNECTED,
+    RECORD_DISCONNECTED,
+    FrameCapture,
+    load_capture,
+)
+from custom_components.amber_websocket.const import CONF_SITE_ID
+from custom_components.amber_websocket.coordinator import AmberCoordinator
+from custom_components.amber_websocket.sensor import SENSOR_DESCRIPTIONS, AmberPriceSensor
+from custom_components.amber_websocket.websocket_client import AmberWebsocketClient
+
+from .payloads import SITE_ID, encoded_payload
+
+
+class CountingSensor(AmberPriceSensor):
+    """Count state writes instead of writing to the state machine."""
+
+    writes = 0
+
+    def async_write_ha_state(self) -> None:
+        CountingSensor.writes += 1
+
+
+def _write_synthetic_capture(path: str, frames: int, forecasts: int, disconnect_every: int) -> None:
+    capture = FrameCapture(path, max_bytes=1 << 30, compress=path.endswith(".gz"))
+    capture.start()
+    capture.record_event(RECORD_CONNECTED)
+    for sequence in range(frames):
+        capture.record(encoded_payload(sequence, forecasts=forecasts))
+        if disconnect_every and (sequence + 1) % disconnect_every == 0:
+            capture.record_event(RECORD_DISCONNECTED, "server_closed")
+            capture.record_event(RECORD_CONNECTED)
+    capture.stop()
+    capture.join()
+
+
+async def _replay(hass: HomeAssistant, path: str, speed: float, profile: bool) -> None:
+    records = load_capture(path)
+    client = AmberWebsocketClient(
+        "bench-token", session=SimpleNamespace(), create_task=hass.async_create_task
+    )
+    client._site_refs[SITE_ID] = 1  # pylint: disable=protected-access
+    coordinator = AmberCoordinator(hass, client, SITE_ID)
+    entry = SimpleNamespace(entry_id="bench", data={CONF_SITE_ID: SITE_ID}, options={})
+    for description in SENSOR_DESCRIPTIONS:
+        await CountingSensor(coordinator, entry, description).async_added_to_hass()
+
+    profiler = cProfile.Profile() if profile else None
+    cpu_started = time.process_time()
+    wall_started = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    frames = await client.async_replay(records, speed=speed)
+    await asyncio.sleep(0)
+    if profiler:
+        profiler.disable()
+    cpu = time.process_time() - cpu_started
+    wall = time.perf_counter() - wall_started
+    await client.async_stop()
+
+    metrics = client.metrics
+    print(
+        f"{frames} frames from {len(records)} records in {wall:.2f}s wall, "
+        f"{cpu * 1e6 / max(frames, 1):.1f} µs CPU/frame, "
+        f"{metrics.coalesced_frames} coalesced, {metrics.reconnects} reconnects, "
+        f"{CountingSensor.writes} sensor writes, "
+        f"fan-out p95 {metrics.fanout_ms.percentile(95)} ms"
+    )
+    if profiler:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as config_dir:
+        path = args.capture
+        if path is None:
+            path = os.path.join(config_dir, "synthetic.jsonl")
+            _write_synthetic_capture(path, args.frames, args.forecasts, args.disconnect_every)
+        hass = HomeAssistant(config_dir)
+        await _replay(hass, path, args.speed, args.profile)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--capture", help="capture file to replay; synthetic frames when omitted")
+    parser.add_argument("--speed", type=float, default=0, help="multiple of real time; 0 is max speed")
+    parser.add_argument("--frames", type=int, default=5000, help="frames in the synthetic capture")
+    parser.add_argument("--forecasts", type=int, default=0)
+    parser.add_argument("--disconnect-every", type=int, default=0)
+    parser.add_argument("--profile", action="store_true", help="print a cProfile summary")
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Local stand-in for the Amber live-prices WebSocket.
+
+Speaks the ``live-prices`` subscribe protocol, replays synthetic payloads at a
+configurable rate and size, and can drop the connection every N frames.
+Run it on its own with::
+
+    python -m benchmarks.mock_server --port 8765 --rate 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import time
+from typing import Any
+
+from aiohttp import WSMsgType, web
+
+from custom_components.amber_websocket.const import SUBSCRIBE_SERVICE
+
+from .payloads import price_payload
+
+_LOGGER = logging.getLogger(__name__)
+
+# Top-level key carrying the server's perf_counter_ns() send time for latency measurements.
+SENT_AT_KEY = "benchSentAt"
+
+
+class MockAmberServer:
+    """Serve Amber-shaped price frames to subscribed sites."""
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        rate: float = 1.0,
+        forecasts: int = 0,
+        frames: int | None = None,
+        disconnect_every: int | None = None,
+        distinct_frames: int = 64,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.rate = rate
+        self.forecasts = forecasts
+        self.frames = frames
+        self.disconnect_every = disconnect_every
+        self.distinct_frames = distinct_frames
+        self.frames_sent = 0
+        self.connections = 0
+        self.disconnects = 0
+        self._runner: web.AppRunner | None = None
+        self._encoded: dict[str, list[str]] = {}
+
+    @property
+    def url(self) -> str:
+        """Return the ws:// URL clients should connect to."""
+        return f"ws://{self.host}:{self.port}/"
+
+    async def start(self) -> str:
+        """Start listening and return the server URL."""
+        app = web.Application()
+        app.router.add_get("/", self._handle_socket)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if self.port == 0:
+            self.port = site._server.sockets[0].getsockname()[1]  # noqa: SLF001
+        return self.url
+
+    async def stop(self) -> None:
+        """Close every connection and stop listening."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _frames_for(self, site_id: str) -> list[str]:
+        # Pre-encode a cycle of payloads so the server's own JSON cost stays off the clock.
+        if site_id not in self._encoded:
+            self._encoded[site_id] = [
+                json.dumps(price_payload(seq, site_id=site_id, forecasts=self.forecasts))[1:]
+                for seq in range(self.distinct_frames)
+            ]
+        return self._encoded[site_id]
+
+    async def _handle_socket(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        if not request.headers.get("authorization", "").startswith("Bearer "):
+            await ws.close(code=4001, message=b"missing token")
+            return ws
+        self.connections += 1
+        sites: list[str] = []
+        producer = asyncio.create_task(self._produce(ws, sites))
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                self._handle_command(json.loads(msg.data), sites)
+        finally:
+            producer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await producer
+        return ws
+
+    def _handle_command(self, command: dict[str, Any], sites: list[str]) -> None:
+        if command.get("service") != SUBSCRIBE_SERVICE:
+            return
+        site_id = command.get("data", {}).get("siteId")
+        if command.get("action") == "subscribe" and site_id not in sites:
+            sites.append(site_id)
+        elif command.get("action") == "unsubscribe" and site_id in sites:
+            sites.remove(site_id)
+
+    async def _produce(self, ws: web.WebSocketResponse, sites: list[str]) -> None:
+        interval = 1 / self.rate if self.rate > 0 else 0
+        sent_on_connection = 0
+        sequence = 0
+        while not ws.closed:
+            if self.frames is not None and self.frames_sent >= self.frames:
+                return
+            for site_id in list(sites):
+                body = self._frames_for(site_id)[sequence % self.distinct_frames]
+                await ws.send_str(f'{{"{SENT_AT_KEY}":{time.perf_counter_ns()},{body}')
+                self.frames_sent += 1
+                sent_on_connection += 1
+            sequence += 1
+            if self.disconnect_every and sent_on_connection >= self.disconnect_every:
+                self.disconnects += 1
+                await ws.close(code=1001, message=b"injected disconnect")
+                return
+            await asyncio.sleep(interval)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    server = MockAmberServer(
+        host=args.host,
+        port=args.port,
+        rate=args.rate,
+        forecasts=args.forecasts,
+        disconnect_every=args.disconnect_every,
+    )
+    url = await server.start()
+    _LOGGER.info("Mock Amber websocket listening on %s", url)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rate", type=float, default=1.0, help="frames per second, 0 = unthrottled")
+    parser.add_argument("--forecasts", type=int, default=0, help="forecast intervals per channel")
+    parser.add_argument("--disconnect-every", type=int, default=None)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_serve(args))
+
+
+if __name__ == "__main__":
+    main()
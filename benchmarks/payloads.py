@@ -0,0 +1,68 @@
+"""Synthetic Amber live-price payloads shared by the benchmarks."""
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+SITE_ID = "01BENCHMARKSITE0000000000"
+CHANNELS = ("general", "feedIn", "controlledLoad")
+NEM_TZ = timezone(timedelta(hours=10))
+
+
+def price_entry(
+    channel: str, start: datetime, per_kwh: float, *, interval_type: str = "CurrentInterval"
+) -> dict[str, Any]:
+    """Return one ``prices`` entry shaped like the Amber feed."""
+    end = start + timedelta(minutes=5)
+    return {
+        "type": interval_type,
+        "date": start.astimezone(NEM_TZ).date().isoformat(),
+        "duration": 5,
+        "startTime": start.isoformat().replace("+00:00", "Z"),
+        "endTime": end.isoformat().replace("+00:00", "Z"),
+        "nemTime": end.astimezone(NEM_TZ).isoformat(),
+        "perKwh": round(per_kwh, 5),
+        "renewables": 42.7,
+        "spotPerKwh": round(per_kwh / 3, 5),
+        "channelType": channel,
+        "spikeStatus": "none",
+        "tariffInformation": {"period": "offPeak", "season": "default"},
+        "descriptor": "low",
+        "estimate": True,
+    }
+
+
+def price_payload(
+    sequence: int = 0,
+    *,
+    site_id: str = SITE_ID,
+    channels: tuple[str, ...] = CHANNELS,
+    forecasts: int = 0,
+) -> dict[str, Any]:
+    """Return a ``price-update`` payload; ``sequence`` nudges the prices per frame."""
+    start = datetime(2025, 11, 1, tzinfo=timezone.utc) + timedelta(minutes=5 * (sequence // 12))
+    prices: list[dict[str, Any]] = []
+    for offset, channel in enumerate(channels):
+        per_kwh = 20.0 + offset + (sequence % 7) * 0.25
+        prices.append(price_entry(channel, start, per_kwh))
+        for step in range(1, forecasts + 1):
+            prices.append(
+                price_entry(
+                    channel,
+                    start + timedelta(minutes=5 * step),
+                    per_kwh + (step % 11) * 0.5,
+                    interval_type="ForecastInterval",
+                )
+            )
+    return {
+        "timestamp": start.isoformat(),
+        "service": "live-prices",
+        "action": "price-update",
+        "data": {"siteId": site_id, "prices": prices},
+    }
+
+
+def encoded_payload(sequence: int = 0, **kwargs: Any) -> str:
+    """Return :func:`price_payload` serialised as a websocket TEXT frame."""
+    return json.dumps(price_payload(sequence, **kwargs))
@@ -2,27 +2,74 @@
 from __future__ import annotations
 
 import logging
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
 
+from .clients import async_get_client, async_release_client
 from .const import (
     CONF_AUTH_TOKEN,
+    CONF_CHANNEL_CONTROLLED_LOAD,
+    CONF_CHANNEL_FEED_IN,
+    CONF_CHANNEL_GENERAL,
+    CONF_COMPRESSION,
+    CONF_COST_RESET_CYCLE,
     CONF_DEBUG_LOGGING,
+    CONF_EVENT_COMPACT,
+    CONF_EVENT_MODE,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_PAYLOAD_TRACE,
+    CONF_PAYLOAD_TRACE_EVERY,
     CONF_SITE_ID,
+    CONF_WATCHDOG_MULTIPLIER,
+    DEFAULT_COMPRESSION,
+    DEFAULT_CONTROLLED_LOAD_ENABLED,
+    DEFAULT_COST_RESET_CYCLE,
+    DEFAULT_EVENT_COMPACT,
+    DEFAULT_EVENT_MODE,
+    DEFAULT_FEED_IN_ENABLED,
+    DEFAULT_GENERAL_ENABLED,
+    DEFAULT_LONG_TERM_STATISTICS,
+    DEFAULT_PAYLOAD_TRACE,
+    DEFAULT_PAYLOAD_TRACE_EVERY,
+    DEFAULT_WATCHDOG_MULTIPLIER,
     DOMAIN,
+    EXPECTED_PRICE_INTERVAL,
     PLATFORMS,
+    POWER_ENTITY_OPTIONS,
+    SIGNAL_COORDINATOR_READY,
+    STORAGE_VERSION,
 )
 from .coordinator import AmberCoordinator
-from .websocket_client import AmberWebsocketClient
+from .sensor import async_apply_channel_options
+from .services import async_setup_services
+from .websocket_api import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__package__)
 
+# Options applied to a running entry without a reload, with their defaults.
+HOT_OPTIONS: dict[str, Any] = {
+    CONF_DEBUG_LOGGING: False,
+    CONF_CHANNEL_GENERAL: DEFAULT_GENERAL_ENABLED,
+    CONF_CHANNEL_FEED_IN: DEFAULT_FEED_IN_ENABLED,
+    CONF_CHANNEL_CONTROLLED_LOAD: DEFAULT_CONTROLLED_LOAD_ENABLED,
+    CONF_WATCHDOG_MULTIPLIER: DEFAULT_WATCHDOG_MULTIPLIER,
+    CONF_EVENT_MODE: DEFAULT_EVENT_MODE,
+    CONF_EVENT_COMPACT: DEFAULT_EVENT_COMPACT,
+    CONF_PAYLOAD_TRACE: DEFAULT_PAYLOAD_TRACE,
+    CONF_PAYLOAD_TRACE_EVERY: DEFAULT_PAYLOAD_TRACE_EVERY,
+}
+
 
 async def async_setup(hass: HomeAssistant, _: ConfigType) -> bool:
     """Set up the integration via YAML (unused but required)."""
     hass.data.setdefault(DOMAIN, {})
+    async_setup_services(hass)
+    async_register_websocket_commands(hass)
     return True
 
 
@@ -33,20 +80,43 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     _configure_logging(entry)
     entry.async_on_unload(entry.add_update_listener(_async_options_updated))
 
-    client = AmberWebsocketClient(
+    site_id = entry.data[CONF_SITE_ID]
+    client = async_get_client(hass, entry.data[CONF_AUTH_TOKEN])
+    coordinator = AmberCoordinator(
         hass,
-        entry.data[CONF_AUTH_TOKEN],
-        entry.data[CONF_SITE_ID],
+        client,
+        site_id,
+        store=_price_store(hass, entry),
+        event_mode=entry.options.get(CONF_EVENT_MODE, DEFAULT_EVENT_MODE),
+        compact_events=entry.options.get(CONF_EVENT_COMPACT, DEFAULT_EVENT_COMPACT),
+        long_term_statistics=entry.options.get(
+            CONF_LONG_TERM_STATISTICS, DEFAULT_LONG_TERM_STATISTICS
+        ),
     )
-    coordinator = AmberCoordinator(client, entry.data[CONF_SITE_ID])
+    _configure_trace(coordinator, entry)
+    await coordinator.async_restore()
+    power_entities = {
+        channel: entry.options[option]
+        for channel, option in POWER_ENTITY_OPTIONS.items()
+        if entry.options.get(option)
+    }
+    if power_entities:
+        coordinator.async_track_power(
+            power_entities, entry.options.get(CONF_COST_RESET_CYCLE, DEFAULT_COST_RESET_CYCLE)
+        )
 
     hass.data[DOMAIN][entry.entry_id] = {
         "client": client,
         "coordinator": coordinator,
+        "options": dict(entry.options),
     }
 
-    await client.async_start()
+    # Sites sharing a token share the socket; the latest setting applies from its next connect.
+    client.set_compression(entry.options.get(CONF_COMPRESSION, DEFAULT_COMPRESSION))
+    await client.async_subscribe(site_id, stale_timeout=_stale_timeout(entry))
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # Lets open price subscriptions pick up the new or reloaded site.
+    async_dispatcher_send(hass, SIGNAL_COORDINATOR_READY, entry.entry_id, coordinator)
     return True
 
 
@@ -54,7 +124,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     stored = hass.data[DOMAIN].get(entry.entry_id)
     if stored:
-        await stored["client"].async_stop()
+        await stored["coordinator"].async_shutdown()
+        await async_release_client(hass, stored["client"], entry.data[CONF_SITE_ID])
 
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
@@ -62,6 +133,27 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted prices when a config entry is deleted."""
+    await _price_store(hass, entry).async_remove()
+
+
+def _price_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
+
+
+def _stale_timeout(entry: ConfigEntry) -> float:
+    multiplier = entry.options.get(CONF_WATCHDOG_MULTIPLIER, DEFAULT_WATCHDOG_MULTIPLIER)
+    return multiplier * EXPECTED_PRICE_INTERVAL
+
+
+def _configure_trace(coordinator: AmberCoordinator, entry: ConfigEntry) -> None:
+    coordinator.set_trace(
+        entry.options.get(CONF_PAYLOAD_TRACE, DEFAULT_PAYLOAD_TRACE),
+        entry.options.get(CONF_PAYLOAD_TRACE_EVERY, DEFAULT_PAYLOAD_TRACE_EVERY),
+    )
+
+
 def _configure_logging(entry: ConfigEntry) -> None:
     is_debug = entry.options.get(CONF_DEBUG_LOGGING, False)
     level = logging.DEBUG if is_debug else logging.INFO
@@ -71,5 +163,30 @@ def _configure_logging(entry: ConfigEntry) -> None:
 
 
 async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    stored = hass.data[DOMAIN].get(entry.entry_id)
+    if stored is None:
+        return
+    previous: dict[str, Any] = stored["options"]
+    current = dict(entry.options)
+    stored["options"] = current
+    changed = {
+        key
+        for key in previous.keys() | current.keys()
+        if previous.get(key, HOT_OPTIONS.get(key)) != current.get(key, HOT_OPTIONS.get(key))
+    }
+    if not changed:
+        return
+    if not changed <= HOT_OPTIONS.keys():
+        _LOGGER.debug("Reloading entry %s for options %s", entry.entry_id, changed)
+        _configure_logging(entry)
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    _LOGGER.debug("Applying options %s to entry %s in place", changed, entry.entry_id)
     _configure_logging(entry)
-    await hass.config_entries.async_reload(entry.entry_id)
+    coordinator: AmberCoordinator = stored["coordinator"]
+    coordinator.event_mode = entry.options.get(CONF_EVENT_MODE, DEFAULT_EVENT_MODE)
+    coordinator.compact_events = entry.options.get(CONF_EVENT_COMPACT, DEFAULT_EVENT_COMPACT)
+    _configure_trace(coordinator, entry)
+    stored["client"].set_stale_timeout(entry.data[CONF_SITE_ID], _stale_timeout(entry))
+    await async_apply_channel_options(hass, entry)
@@ -0,0 +1,187 @@
+"""Headless command line for the Amber websocket core, without Home Assistant running.
+
+Connect live, or replay a capture from the ``amber_websocket.start_capture``
+service, and print each price update as a JSON line. Run from the repository
+root; wrap with ``python -m cProfile`` or any other profiler to measure the
+hot path::
+
+    python -m custom_components.amber_websocket listen --site 01ABC --token $AMBER_TOKEN
+    python -m custom_components.amber_websocket replay amber_websocket_capture.jsonl --quiet
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections.abc import Iterable
+from types import SimpleNamespace
+
+from aiohttp import ClientSession
+
+from .capture import RECORD_BINARY, RECORD_TEXT, CaptureRecord, FrameCapture, load_capture
+from .const import COMPRESSION_WINDOW_BITS, DEFAULT_COMPRESSION
+from .decoder import DECODERS, PayloadDecoder, get_decoder
+from .price_coordinator import PriceCoordinator
+from .websocket_client import AmberWebsocketClient
+
+
+def _watch(
+    client: AmberWebsocketClient, site_ids: Iterable[str], decoder: PayloadDecoder, quiet: bool
+) -> list[PriceCoordinator]:
+    coordinators = []
+    for site_id in site_ids:
+        coordinator = PriceCoordinator(client, site_id)
+        if not quiet:
+
+            def _print(coordinator: PriceCoordinator = coordinator) -> None:
+                last_update = coordinator.last_update_at()
+                print(
+                    decoder.dumps(
+                        {
+                            "site_id": coordinator.site_id,
+                            "last_update": last_update.isoformat() if last_update else None,
+                            "channels": coordinator.channel_summaries(),
+                        }
+                    ),
+                    flush=True,
+                )
+
+            coordinator.async_add_listener(_print)
+        coordinators.append(coordinator)
+    return coordinators
+
+
+def _report(
+    client: AmberWebsocketClient, frames: int, wall: float, cpu: float, show_metrics: bool
+) -> None:
+    metrics = client.metrics
+    print(
+        f"{frames} frames in {wall:.2f}s wall, {cpu * 1e6 / max(frames, 1):.1f} µs CPU/frame, "
+        f"{metrics.coalesced_frames} coalesced, {metrics.decode_failures} decode failures, "
+        f"{metrics.reconnects} reconnects",
+        file=sys.stderr,
+    )
+    if show_metrics:
+        print(get_decoder().dumps(metrics.as_dict()), file=sys.stderr)
+
+
+def _replay_sites(records: list[CaptureRecord], decoder: PayloadDecoder) -> list[str]:
+    """Return the site ids found in a capture's frames, in first-seen order."""
+    sites: dict[str, None] = {}
+    for record in records:
+        if record.kind not in (RECORD_TEXT, RECORD_BINARY):
+            continue
+        try:
+            data = decoder.loads(record.data)
+        except decoder.errors:
+            continue
+        body = data.get("data") if isinstance(data, dict) else None
+        if isinstance(body, dict) and body.get("siteId"):
+            sites[body["siteId"]] = None
+    return list(sites)
+
+
+async def _async_listen(args: argparse.Namespace, decoder: PayloadDecoder) -> None:
+    if not args.token:
+        raise SystemExit("An auth token is required: pass --token or set AMBER_TOKEN")
+    async with ClientSession() as session:
+        client = AmberWebsocketClient(args.token, session=session, decoder=decoder)
+        client.set_compression(args.compression)
+        coordinators = _watch(client, args.site, decoder, args.quiet)
+        if args.capture:
+            capture = FrameCapture(args.capture, compress=args.capture.endswith(".gz"))
+            capture.open()
+            client.start_capture(capture)
+        cpu_started = time.process_time()
+        wall_started = time.perf_counter()
+        try:
+            for site_id in args.site:
+                await client.async_subscribe(site_id, stale_timeout=args.stale_timeout)
+            if args.duration:
+                await asyncio.sleep(args.duration)
+            else:
+                await asyncio.Event().wait()
+        finally:
+            for coordinator in coordinators:
+                await coordinator.async_shutdown()
+            for site_id in args.site:
+                await client.async_unsubscribe(site_id)
+            _report(
+                client,
+                client.metrics.frames_received,
+                time.perf_counter() - wall_started,
+                time.process_time() - cpu_started,
+                args.metrics,
+            )
+
+
+async def _async_replay(args: argparse.Namespace, decoder: PayloadDecoder) -> None:
+    records = load_capture(args.capture)
+    site_ids = args.site or _replay_sites(records, decoder)
+    # Replays never connect, so the client needs no real session.
+    client = AmberWebsocketClient("replay", session=SimpleNamespace(), decoder=decoder)
+    coordinators = _watch(client, site_ids, decoder, args.quiet)
+    cpu_started = time.process_time()
+    wall_started = time.perf_counter()
+    frames = await client.async_replay(records, speed=args.speed)
+    # Let the dispatcher apply the last queued frames.
+    await asyncio.sleep(0)
+    cpu = time.process_time() - cpu_started
+    wall = time.perf_counter() - wall_started
+    for coordinator in coordinators:
+        await coordinator.async_shutdown()
+    await client.async_stop()
+    _report(client, frames, wall, cpu, args.metrics)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Parse the command line and run the chosen subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="python -m custom_components.amber_websocket",
+        description=__doc__.splitlines()[0],
+    )
+    parser.add_argument(
+        "--decoder", choices=sorted(DECODERS), help="JSON backend; the fastest by default"
+    )
+    parser.add_argument("--quiet", action="store_true", help="do not print price updates")
+    parser.add_argument(
+        "--metrics", action="store_true", help="print the client metrics as JSON on exit"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    listen = commands.add_parser("listen", help="connect to Amber and follow live prices")
+    listen.add_argument("--token", default=os.environ.get("AMBER_TOKEN"))
+    listen.add_argument("--site", action="append", required=True, help="site id; repeatable")
+    listen.add_argument("--duration", type=float, default=0, help="seconds to run; 0 is forever")
+    listen.add_argument("--capture", help="also write every frame to this capture file")
+    listen.add_argument(
+        "--stale-timeout", type=float, default=600, help="watchdog seconds; 0 disables it"
+    )
+    listen.add_argument(
+        "--compression",
+        type=int,
+        choices=COMPRESSION_WINDOW_BITS,
+        default=DEFAULT_COMPRESSION,
+        help="permessage-deflate window bits; 0 disables it",
+    )
+
+    replay = commands.add_parser("replay", help="feed a capture file through the core")
+    replay.add_argument("capture")
+    replay.add_argument("--site", action="append", help="site id; read from the capture by default")
+    replay.add_argument(
+        "--speed", type=float, default=0, help="multiple of real time; 0 is max speed"
+    )
+
+    args = parser.parse_args(argv)
+    decoder = get_decoder(args.decoder)
+    runner = _async_listen if args.command == "listen" else _async_replay
+    try:
+        asyncio.run(runner(args, decoder))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""Record raw websocket frames to disk and read them back for replay."""
+from __future__ import annotations
+
+import base64
+import gzip
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import IO
+
+from .decoder import Frame
+
+_LOGGER = logging.getLogger(__name__)
+
+RECORD_TEXT = "text"
+RECORD_BINARY = "binary"
+RECORD_CONNECTED = "connected"
+RECORD_DISCONNECTED = "disconnected"
+
+DEFAULT_CAPTURE_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_CAPTURE_BACKUPS = 3
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+@dataclass(slots=True, frozen=True)
+class CaptureRecord:
+    """One captured frame or connection event with its monotonic receive time."""
+
+    at: float
+    kind: str
+    data: Frame | None = None
+    cause: str | None = None
+
+
+class FrameCapture:
+    """Write frames to a size-capped rotating JSONL file from a background thread.
+
+    ``record`` and ``record_event`` only enqueue, so the event loop never waits
+    on disk I/O. When the current file passes ``max_bytes`` (uncompressed) it is
+    renamed to ``<path>.1``, older files shift up and at most ``backups`` are kept.
+    If writing fails the capture stops accepting records, so the queue cannot
+    grow without bound, and ``on_error`` is called from the writer thread.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        max_bytes: int = DEFAULT_CAPTURE_MAX_BYTES,
+        backups: int = DEFAULT_CAPTURE_BACKUPS,
+        compress: bool = False,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.compress = compress
+        self.records_written = 0
+        self.rotations = 0
+        self.error: Exception | None = None
+        self._handle: IO[str] | None = None
+        self._on_error: Callable[[Exception], None] | None = None
+        self._queue: queue.SimpleQueue[CaptureRecord | None] = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._writer, name="Amber websocket capture", daemon=True
+        )
+
+    def open(self) -> None:
+        """Open the capture file so path errors surface early; blocking, so use an executor."""
+        if self._handle is None:
+            self._handle = self._open()
+
+    def start(self, on_error: Callable[[Exception], None] | None = None) -> None:
+        """Start the writer thread."""
+        self._on_error = on_error
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Ask the writer to flush and exit once the queue is drained."""
+        self._queue.put(None)
+
+    def join(self, timeout: float | None = None) -> None:
+        """Wait for the writer thread; blocking, so call it from an executor."""
+        self._thread.join(timeout)
+
+    def record(self, frame: Frame) -> None:
+        """Queue a received frame."""
+        if self.error is not None:
+            return
+        kind = RECORD_TEXT if isinstance(frame, str) else RECORD_BINARY
+        self._queue.put(CaptureRecord(time.monotonic(), kind, frame))
+
+    def record_event(self, kind: str, cause: str | None = None) -> None:
+        """Queue a connection event so replays reproduce reconnect sequences."""
+        if self.error is not None:
+            return
+        self._queue.put(CaptureRecord(time.monotonic(), kind, cause=cause))
+
+    def _open(self) -> IO[str]:
+        if self.compress:
+            return gzip.open(self.path, "at", encoding="utf-8")
+        return open(self.path, "a", encoding="utf-8")
+
+    def _rotate(self) -> None:
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self.rotations += 1
+
+    def _writer(self) -> None:
+        handle = self._handle
+        written = 0
+        try:
+            if handle is None:
+                handle = self._open()
+            while (record := self._queue.get()) is not None:
+                line = _encode_record(record)
+                handle.write(line)
+                written += len(line)
+                self.records_written += 1
+                if written >= self.max_bytes:
+                    handle.close()
+                    self._rotate()
+                    handle = self._open()
+                    written = 0
+        except Exception as err:  # pylint: disable=broad-except
+            self.error = err
+            _LOGGER.warning("Amber websocket capture to %s stopped: %s", self.path, err)
+            # Drop whatever was queued before record() saw the error.
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if self._on_error is not None:
+                self._on_error(err)
+        finally:
+            if handle is not None:
+                handle.close()
+        _LOGGER.debug("Capture to %s wrote %s records", self.path, self.records_written)
+
+
+def _encode_record(record: CaptureRecord) -> str:
+    line: dict[str, object] = {"t": record.at, "type": record.kind}
+    if record.kind == RECORD_TEXT:
+        line["data"] = record.data
+    elif record.kind == RECORD_BINARY:
+        line["data"] = base64.b64encode(bytes(record.data)).decode("ascii")
+    if record.cause is not None:
+        line["cause"] = record.cause
+    return json.dumps(line, separators=(",", ":")) + "\n"
+
+
+def _decode_record(line: str) -> CaptureRecord:
+    raw = json.loads(line)
+    kind = raw["type"]
+    data = raw.get("data")
+    if kind == RECORD_BINARY and data is not None:
+        data = base64.b64decode(data)
+    return CaptureRecord(raw["t"], kind, data, raw.get("cause"))
+
+
+def capture_files(path: str) -> list[str]:
+    """Return a capture's files oldest first, including rotated backups."""
+    backups: list[tuple[int, str]] = []
+    directory, name = os.path.split(path)
+    for candidate in os.listdir(directory or "."):
+        suffix = candidate[len(name) + 1 :]
+        if candidate.startswith(f"{name}.") and suffix.isdigit():
+            backups.append((int(suffix), os.path.join(directory, candidate)))
+    files = [file for _, file in sorted(backups, reverse=True)]
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+def iter_capture(path: str) -> Iterator[CaptureRecord]:
+    """Yield every record in a capture, reading rotated backups first."""
+    for file in capture_files(path):
+        with open(file, "rb") as probe:
+            compressed = probe.read(2) == _GZIP_MAGIC
+        opener = gzip.open if compressed else open
+        with opener(file, "rt", encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    yield _decode_record(line)
+
+
+def load_capture(path: str) -> list[CaptureRecord]:
+    """Read a whole capture into memory; blocking, so call it from an executor."""
+    return list(iter_capture(path))
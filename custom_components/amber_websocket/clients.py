@@ -0,0 +1,33 @@
+"""Share one websocket client per auth token across config entries."""
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import DATA_CLIENTS
+from .websocket_client import AmberWebsocketClient
+
+
+@callback
+def async_get_client(hass: HomeAssistant, auth_token: str) -> AmberWebsocketClient:
+    """Return the shared client for an auth token, creating it if needed."""
+    clients: dict[str, AmberWebsocketClient] = hass.data.setdefault(DATA_CLIENTS, {})
+    client = clients.get(auth_token)
+    if client is None or client.closing:
+        client = AmberWebsocketClient(
+            auth_token,
+            session=async_get_clientsession(hass),
+            create_task=hass.async_create_task,
+        )
+        clients[auth_token] = client
+    return client
+
+
+async def async_release_client(
+    hass: HomeAssistant, client: AmberWebsocketClient, site_id: str
+) -> None:
+    """Drop one site reference and forget the client once no sites remain."""
+    await client.async_unsubscribe(site_id)
+    clients: dict[str, AmberWebsocketClient] = hass.data.get(DATA_CLIENTS, {})
+    if client.closing and clients.get(client.auth_token) is client:
+        clients.pop(client.auth_token)
@@ -5,18 +5,48 @@ from typing import Any
 
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.helpers import selector
 
 from .const import (
     CONF_AUTH_TOKEN,
     CONF_CHANNEL_CONTROLLED_LOAD,
     CONF_CHANNEL_FEED_IN,
     CONF_CHANNEL_GENERAL,
+    CONF_COMPACT_ENTITIES,
+    CONF_COMPRESSION,
+    CONF_COST_RESET_CYCLE,
     CONF_DEBUG_LOGGING,
+    CONF_EVENT_COMPACT,
+    CONF_EVENT_MODE,
+    CONF_EXPORT_POWER_ENTITY,
+    CONF_IMPORT_POWER_ENTITY,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_PAYLOAD_TRACE,
+    CONF_PAYLOAD_TRACE_EVERY,
     CONF_SITE_ID,
+    CONF_WATCHDOG_MULTIPLIER,
+    COMPRESSION_WINDOW_BITS,
+    DEFAULT_COMPACT_ENTITIES,
+    DEFAULT_COMPRESSION,
     DEFAULT_CONTROLLED_LOAD_ENABLED,
+    DEFAULT_COST_RESET_CYCLE,
+    DEFAULT_EVENT_COMPACT,
+    DEFAULT_EVENT_MODE,
     DEFAULT_FEED_IN_ENABLED,
     DEFAULT_GENERAL_ENABLED,
+    DEFAULT_LONG_TERM_STATISTICS,
+    DEFAULT_PAYLOAD_TRACE,
+    DEFAULT_PAYLOAD_TRACE_EVERY,
+    DEFAULT_WATCHDOG_MULTIPLIER,
     DOMAIN,
+    EVENT_MODES,
+    PAYLOAD_TRACE_MODES,
+)
+from .cost import RESET_CYCLES
+
+POWER_SELECTOR = selector.EntitySelector(
+    selector.EntitySelectorConfig(domain="sensor", device_class=SensorDeviceClass.POWER)
 )
 
 
@@ -60,21 +90,71 @@ class AmberOptionsFlow(config_entries.OptionsFlow):
             return self.async_create_entry(title="", data=user_input)
 
         current = self.entry.options.get(CONF_DEBUG_LOGGING, False)
+        payload_trace = self.entry.options.get(CONF_PAYLOAD_TRACE, DEFAULT_PAYLOAD_TRACE)
+        payload_trace_every = self.entry.options.get(
+            CONF_PAYLOAD_TRACE_EVERY, DEFAULT_PAYLOAD_TRACE_EVERY
+        )
         general_enabled = self.entry.options.get(CONF_CHANNEL_GENERAL, DEFAULT_GENERAL_ENABLED)
         feed_enabled = self.entry.options.get(CONF_CHANNEL_FEED_IN, DEFAULT_FEED_IN_ENABLED)
         controlled_enabled = self.entry.options.get(
             CONF_CHANNEL_CONTROLLED_LOAD, DEFAULT_CONTROLLED_LOAD_ENABLED
         )
+        compact_entities = self.entry.options.get(
+            CONF_COMPACT_ENTITIES, DEFAULT_COMPACT_ENTITIES
+        )
+        watchdog_multiplier = self.entry.options.get(
+            CONF_WATCHDOG_MULTIPLIER, DEFAULT_WATCHDOG_MULTIPLIER
+        )
+        compression = self.entry.options.get(CONF_COMPRESSION, DEFAULT_COMPRESSION)
+        event_mode = self.entry.options.get(CONF_EVENT_MODE, DEFAULT_EVENT_MODE)
+        event_compact = self.entry.options.get(CONF_EVENT_COMPACT, DEFAULT_EVENT_COMPACT)
+        long_term_statistics = self.entry.options.get(
+            CONF_LONG_TERM_STATISTICS, DEFAULT_LONG_TERM_STATISTICS
+        )
+        cost_reset_cycle = self.entry.options.get(CONF_COST_RESET_CYCLE, DEFAULT_COST_RESET_CYCLE)
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema(
                 {
                     vol.Optional(CONF_DEBUG_LOGGING, default=current): bool,
+                    vol.Optional(CONF_PAYLOAD_TRACE, default=payload_trace): vol.In(
+                        PAYLOAD_TRACE_MODES
+                    ),
+                    vol.Optional(
+                        CONF_PAYLOAD_TRACE_EVERY, default=payload_trace_every
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10000)),
                     vol.Optional(CONF_CHANNEL_GENERAL, default=general_enabled): bool,
                     vol.Optional(CONF_CHANNEL_FEED_IN, default=feed_enabled): bool,
                     vol.Optional(
                         CONF_CHANNEL_CONTROLLED_LOAD, default=controlled_enabled
                     ): bool,
+                    vol.Optional(CONF_COMPACT_ENTITIES, default=compact_entities): bool,
+                    vol.Optional(
+                        CONF_WATCHDOG_MULTIPLIER, default=watchdog_multiplier
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=12)),
+                    vol.Optional(CONF_COMPRESSION, default=compression): vol.All(
+                        vol.Coerce(int), vol.In(COMPRESSION_WINDOW_BITS)
+                    ),
+                    vol.Optional(CONF_EVENT_MODE, default=event_mode): vol.In(EVENT_MODES),
+                    vol.Optional(CONF_EVENT_COMPACT, default=event_compact): bool,
+                    vol.Optional(
+                        CONF_LONG_TERM_STATISTICS, default=long_term_statistics
+                    ): bool,
+                    vol.Optional(
+                        CONF_IMPORT_POWER_ENTITY,
+                        description={
+                            "suggested_value": self.entry.options.get(CONF_IMPORT_POWER_ENTITY)
+                        },
+                    ): POWER_SELECTOR,
+                    vol.Optional(
+                        CONF_EXPORT_POWER_ENTITY,
+                        description={
+                            "suggested_value": self.entry.options.get(CONF_EXPORT_POWER_ENTITY)
+                        },
+                    ): POWER_SELECTOR,
+                    vol.Optional(CONF_COST_RESET_CYCLE, default=cost_reset_cycle): vol.In(
+                        RESET_CYCLES
+                    ),
                 }
             ),
         )
@@ -1,10 +1,16 @@
-"""Constants for the Amber WebSocket integration."""
-from homeassistant.const import Platform
+"""Constants for the Amber WebSocket integration.
+
+Kept free of Home Assistant imports so the asyncio core and CLI can use them.
+"""
 
 DOMAIN = "amber_websocket"
-PLATFORMS = [Platform.SENSOR]
+PLATFORMS = ["sensor"]
 WS_URL = "wss://api-ws.amber.com.au"
 EVENT_PRICE_UPDATE = "amber_websocket_event"
+ATTR_RESTORED = "restored"
+ATTR_STALE = "stale"
+DATA_CLIENTS = f"{DOMAIN}_clients"
+SIGNAL_COORDINATOR_READY = f"{DOMAIN}_coordinator_ready"
 ORIGIN_HEADER = "https://amber-websocket.home-assistant.local"
 CONF_AUTH_TOKEN = "auth_token"
 CONF_SITE_ID = "site_id"
@@ -12,8 +18,16 @@ CONF_DEBUG_LOGGING = "debug_logging"
 CONF_CHANNEL_GENERAL = "channel_general"
 CONF_CHANNEL_FEED_IN = "channel_feed_in"
 CONF_CHANNEL_CONTROLLED_LOAD = "channel_controlled_load"
+CONF_WATCHDOG_MULTIPLIER = "watchdog_multiplier"
+CONF_EVENT_MODE = "event_mode"
+CONF_EVENT_COMPACT = "event_compact"
+EVENT_MODE_ALL = "all"
+EVENT_MODE_CHANGES = "changes"
+EVENT_MODE_OFF = "off"
+EVENT_MODES = [EVENT_MODE_ALL, EVENT_MODE_CHANGES, EVENT_MODE_OFF]
 MIN_RECONNECT_DELAY = 5
 MAX_RECONNECT_DELAY = 60
+EXPECTED_PRICE_INTERVAL = 300
 SUBSCRIBE_SERVICE = "live-prices"
 CHANNEL_GENERAL = "general"
 CHANNEL_FEED_IN = "feedIn"
@@ -21,4 +35,58 @@ CHANNEL_CONTROLLED_LOAD = "controlledLoad"
 DEFAULT_GENERAL_ENABLED = True
 DEFAULT_FEED_IN_ENABLED = True
 DEFAULT_CONTROLLED_LOAD_ENABLED = False
+DEFAULT_WATCHDOG_MULTIPLIER = 2
+DEFAULT_EVENT_MODE = EVENT_MODE_ALL
+DEFAULT_EVENT_COMPACT = False
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 30
 
+SERVICE_START_CAPTURE = "start_capture"
+SERVICE_STOP_CAPTURE = "stop_capture"
+SERVICE_REPLAY_CAPTURE = "replay_capture"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_PATH = "path"
+ATTR_MAX_MEGABYTES = "max_megabytes"
+ATTR_BACKUPS = "backups"
+ATTR_COMPRESS = "compress"
+ATTR_SPEED = "speed"
+SERVICE_FIND_CHEAPEST_WINDOW = "find_cheapest_window"
+ATTR_CHANNEL = "channel"
+ATTR_INTERVALS = "intervals"
+ATTR_CONTIGUOUS = "contiguous"
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+PRICE_EXPIRY_GRACE = 60
+CONF_LONG_TERM_STATISTICS = "long_term_statistics"
+DEFAULT_LONG_TERM_STATISTICS = False
+CONF_IMPORT_POWER_ENTITY = "import_power_entity"
+CONF_EXPORT_POWER_ENTITY = "export_power_entity"
+CONF_COST_RESET_CYCLE = "cost_reset_cycle"
+DEFAULT_COST_RESET_CYCLE = "daily"
+POWER_ENTITY_OPTIONS = {
+    CHANNEL_GENERAL: CONF_IMPORT_POWER_ENTITY,
+    CHANNEL_FEED_IN: CONF_EXPORT_POWER_ENTITY,
+}
+CONF_COMPRESSION = "compression"
+# 0 disables permessage-deflate; 9-15 ask the server for a 2**bits byte window,
+# trading compression ratio for less deflate memory per connection.
+COMPRESSION_WINDOW_BITS = [0, 9, 10, 11, 12, 13, 14, 15]
+DEFAULT_COMPRESSION = 0
+PING_INTERVAL = 30
+PONG_TIMEOUT = 15
+MIN_RECEIVE_TIMEOUT = 0.01
+CONF_COMPACT_ENTITIES = "compact_entities"
+DEFAULT_COMPACT_ENTITIES = False
+CONF_PAYLOAD_TRACE = "payload_trace"
+CONF_PAYLOAD_TRACE_EVERY = "payload_trace_every"
+PAYLOAD_TRACE_OFF = "off"
+PAYLOAD_TRACE_SAMPLED = "sampled"
+PAYLOAD_TRACE_CHANGES = "changes"
+PAYLOAD_TRACE_MODES = [PAYLOAD_TRACE_OFF, PAYLOAD_TRACE_SAMPLED, PAYLOAD_TRACE_CHANGES]
+DEFAULT_PAYLOAD_TRACE = PAYLOAD_TRACE_OFF
+DEFAULT_PAYLOAD_TRACE_EVERY = 100
+# Repeated connection failures are summarised in one warning per this many seconds.
+RECONNECT_WARNING_INTERVAL = 300
+# One event in this many is encoded to refresh the estimated event size.
+EVENT_SIZE_SAMPLE_EVERY = 20
+DATA_THRESHOLDS = f"{DOMAIN}_thresholds"
+EVENT_THRESHOLD = "amber_websocket_threshold"
@@ -2,75 +2,378 @@
 from __future__ import annotations
 
 import logging
+import time
 from collections.abc import Callable
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any
 
+from homeassistant.const import (
+    ATTR_UNIT_OF_MEASUREMENT,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+)
+from homeassistant.core import Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import async_track_state_change_event, async_track_time_change
+from homeassistant.helpers.storage import Store
 from homeassistant.util import dt as dt_util
 
+from .const import (
+    DATA_THRESHOLDS,
+    EVENT_MODE_ALL,
+    EVENT_MODE_CHANGES,
+    EVENT_MODE_OFF,
+    EVENT_PRICE_UPDATE,
+    EVENT_SIZE_SAMPLE_EVERY,
+    EVENT_THRESHOLD,
+    PRICE_EXPIRY_GRACE,
+    STORAGE_SAVE_DELAY,
+)
+from .cost import POWER_TO_KW, RESET_NEVER, CostAccumulator, cycle_start
+from .decoder import get_decoder
+from .history import PriceHistory
+from .long_term_statistics import async_import_hours, hour_floor
+from .models import ChannelPrice
+from .price_coordinator import CONNECTION_KEY, FieldKey, PriceCoordinator
+from .scheduler import async_get_scheduler
+from .thresholds import TRIGGER_SPIKE_CHANGED, Crossing, ThresholdIndex, threshold_price
+
 _LOGGER = logging.getLogger(__name__)
 
+# Pseudo source key that changes when a channel's current interval expires or is renewed.
+EXPIRY_KEY = "expiry"
+# Pseudo source key that changes with a channel's running energy cost.
+COST_KEY = "cost"
+
+
+@callback
+def async_get_thresholds(hass: HomeAssistant, site_id: str) -> ThresholdIndex:
+    """Return a site's threshold index, kept across config entry reloads."""
+    indexes: dict[str, ThresholdIndex] = hass.data.setdefault(DATA_THRESHOLDS, {})
+    index = indexes.get(site_id)
+    if index is None:
+        index = indexes[site_id] = ThresholdIndex()
+    return index
+
+
+class AmberCoordinator(PriceCoordinator):
+    """Add persistence, bus events, expiry and cost tracking to the price core."""
 
-class AmberCoordinator:
-    """Keep track of the latest payload and notify listeners."""
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        websocket_client,
+        site_id: str,
+        *,
+        store: Store | None = None,
+        event_mode: str = EVENT_MODE_ALL,
+        compact_events: bool = False,
+        long_term_statistics: bool = False,
+    ) -> None:
+        self.hass = hass
+        self.long_term_statistics = long_term_statistics
+        self.statistics_imported = 0
+        self._statistics_through: dict[str, float] = {}
+        self.event_mode = event_mode
+        self.compact_events = compact_events
+        self.events_fired = 0
+        self.events_suppressed = 0
+        self.event_bytes = 0
+        self.suppressed_bytes = 0
+        self._events_seen = 0
+        # Latest sampled encoded event size, per compact_events setting.
+        self._event_sizes: dict[bool, int] = {}
+        self._expired: set[str] = set()
+        self._expiry_callbacks: dict[str, Callable[[], None]] = {}
+        self._costs: dict[str, CostAccumulator] = {}
+        self._cost_reset_cycle = RESET_NEVER
+        self._unsub_costs: list[Callable[[], None]] = []
+        self._scheduler = async_get_scheduler(hass)
+        self._thresholds = async_get_thresholds(hass, site_id)
+        self._crossings: list[tuple[str, ChannelPrice, ChannelPrice, Crossing]] = []
+        self.thresholds_fired = 0
+        self.restored = False
+        self._refresh_all = False
+        self._store = store
+        self._save_pending = False
+        self._started = time.monotonic()
+        self._received_live = False
+        super().__init__(websocket_client, site_id)
+
+    async def async_shutdown(self) -> None:
+        """Stop receiving payloads and cancel timers and power trackers."""
+        await super().async_shutdown()
+        for unsub in self._unsub_costs:
+            unsub()
+        self._unsub_costs = []
+        for channel in self._channel_cache:
+            self._scheduler.async_cancel((self.site_id, channel))
+
+    async def async_restore(self) -> None:
+        """Load the last persisted payload so sensors can publish before the first frame."""
+        if self._store is None:
+            return
+        stored = await self._store.async_load()
+        if not stored or not isinstance(stored.get("payload"), dict):
+            return
+        for channel, rows in (stored.get("history") or {}).items():
+            self._history[channel] = PriceHistory.from_entries(rows)
+        for channel, cost in (stored.get("costs") or {}).items():
+            self._costs[channel] = CostAccumulator.from_dict(cost)
+        received_at = dt_util.parse_datetime(stored.get("received_at") or "")
+        self.restored = True
+        self._apply_payload(stored["payload"], received_at)
+        # Only live frames fire triggers.
+        self._crossings = []
+        _LOGGER.debug(
+            "Site %s restored %s channels from %s",
+            self.site_id,
+            len(self._channel_cache),
+            received_at,
+        )
 
-    def __init__(self, websocket_client, site_id: str) -> None:
-        self._listeners: list[Callable[[], None]] = []
-        self._channel_cache: dict[str, dict[str, Any]] = {}
-        self.data: dict[str, Any] | None = None
-        self._last_update: datetime | None = None
-        self.site_id = site_id
-        websocket_client.add_listener(self._handle_payload)
-        _LOGGER.debug("Coordinator initialised for site %s", site_id)
+    def _data_to_store(self) -> dict[str, Any]:
+        self._save_pending = False
+        return {
+            "payload": self.data,
+            "received_at": self._last_update.isoformat() if self._last_update else None,
+            "history": {
+                channel: history.entries() for channel, history in self._history.items()
+            },
+            "costs": {channel: cost.as_dict() for channel, cost in self._costs.items()},
+        }
 
     def _handle_payload(self, payload: dict[str, Any]) -> None:
-        self.data = payload
-        self._last_update = dt_util.utcnow()
-        prices = payload.get("data", {}).get("prices", [])
-        self._channel_cache = {
-            price.get("channelType"): price for price in prices if price.get("channelType")
+        if self.restored:
+            # Rewrite every sensor so the restored/stale markers are cleared.
+            self._channel_cache = {}
+            self.restored = False
+            self._refresh_all = True
+        if not self._received_live:
+            self._received_live = True
+            _LOGGER.info(
+                "Site %s received first live prices %.1fs after startup",
+                self.site_id,
+                time.monotonic() - self._started,
+            )
+        super()._handle_payload(payload)
+
+    def _payload_applied(self, payload: dict[str, Any], changed: set[FieldKey]) -> None:
+        if self._refresh_all:
+            # History, cost and other derived sensors carry the marker too, even when
+            # their own figures did not move.
+            self._refresh_all = False
+            changed.update(self._field_listeners)
+        self._save()
+        self._fire_event(payload, changed)
+        self._fire_crossings()
+
+    def _fire_event(self, payload: dict[str, Any], changed: set[FieldKey]) -> None:
+        suppressed = self.event_mode == EVENT_MODE_OFF or (
+            self.event_mode == EVENT_MODE_CHANGES and changed <= {CONNECTION_KEY}
+        )
+        # Encoding every event just to size it would cost a full dump per frame, so
+        # sizes are sampled and suppressed events are counted at the size they would have had.
+        self._events_seen += 1
+        sample = (
+            self.compact_events not in self._event_sizes
+            or self._events_seen % EVENT_SIZE_SAMPLE_EVERY == 0
+        )
+        if suppressed and not sample:
+            self.events_suppressed += 1
+            self.suppressed_bytes += self._event_sizes[self.compact_events]
+            return
+        event_data: dict[str, Any] = {"site_id": self.site_id}
+        if self.compact_events:
+            event_data["channels"] = self.channel_summaries()
+        else:
+            event_data["payload"] = payload
+        if sample:
+            self._event_sizes[self.compact_events] = len(get_decoder().dumps(event_data))
+        size = self._event_sizes[self.compact_events]
+        if suppressed:
+            self.events_suppressed += 1
+            self.suppressed_bytes += size
+            return
+        self.events_fired += 1
+        self.event_bytes += size
+        self.hass.bus.async_fire(EVENT_PRICE_UPDATE, event_data)
+
+    def _fire_crossings(self) -> None:
+        crossings, self._crossings = self._crossings, []
+        for channel, old, new, (trigger_type, value, actions) in crossings:
+            data: dict[str, Any] = {
+                "site_id": self.site_id,
+                "channel": channel,
+                "type": trigger_type,
+                "price": threshold_price(channel, new),
+                "previous_price": threshold_price(channel, old),
+                "spike_status": new.spike_status,
+                "previous_spike_status": old.spike_status,
+            }
+            if trigger_type == TRIGGER_SPIKE_CHANGED:
+                data["to"] = value
+            else:
+                data["threshold"] = value
+            self.thresholds_fired += 1
+            self.hass.bus.async_fire(EVENT_THRESHOLD, data)
+            for action in actions:
+                action(data)
+
+    def _channels_applied(self, channel_cache: dict[str, ChannelPrice]) -> set[FieldKey]:
+        changed = self._schedule_expiry(channel_cache)
+        if self._thresholds:
+            for channel, new in channel_cache.items():
+                old = self._channel_cache.get(channel)
+                self._crossings.extend(
+                    (channel, old, new, crossing)
+                    for crossing in self._thresholds.crossings(channel, old, new)
+                )
+        if self._costs:
+            now = dt_util.utcnow()
+            for channel, cost in self._costs.items():
+                price = channel_cache.get(channel)
+                cost.set_price(price.per_kwh if price else None, now)
+        if self.long_term_statistics:
+            for channel, price in channel_cache.items():
+                if price.start_time is not None:
+                    self._import_statistics(
+                        channel, self._history[channel], price.start_time.timestamp()
+                    )
+        return changed
+
+    @callback
+    def async_track_power(self, entities: dict[str, str], reset_cycle: str) -> None:
+        """Integrate each channel's price against the power entity mapped to it.
+
+        ``entities`` maps a channel to a power sensor entity id; the running
+        costs reset at local midnight at the start of each ``reset_cycle``.
+        """
+        self._costs = {
+            channel: self._costs.get(channel) or CostAccumulator() for channel in entities
         }
-        _LOGGER.debug(
-            "Site %s received %s channel price entries", self.site_id, len(self._channel_cache)
+        self._cost_reset_cycle = reset_cycle
+        now = dt_util.utcnow()
+        for channel, entity_id in entities.items():
+            cost = self._costs[channel]
+            price = self._channel_cache.get(channel)
+            cost.set_price(price.per_kwh if price else None, now)
+            cost.set_power(_power_kw(self.hass.states.get(entity_id)), now)
+        self._reset_costs(now)
+        channels_by_entity = {entity_id: channel for channel, entity_id in entities.items()}
+
+        @callback
+        def _handle_power(event: Event) -> None:
+            channel = channels_by_entity[event.data["entity_id"]]
+            self._costs[channel].set_power(_power_kw(event.data["new_state"]), dt_util.utcnow())
+            self._save()
+            self._notify({(channel, COST_KEY)})
+
+        self._unsub_costs.append(
+            async_track_state_change_event(self.hass, list(channels_by_entity), _handle_power)
         )
-        for channel, data in self._channel_cache.items():
-            _LOGGER.debug("Channel %s data: %s", channel, data)
-        for listener in list(self._listeners):
-            listener()
-
-    def async_add_listener(self, callback: Callable[[], None]) -> Callable[[], None]:
-        """Register a callback for state updates."""
-        self._listeners.append(callback)
-        _LOGGER.debug("Added listener to coordinator for site %s", self.site_id)
-
-        def _remove() -> None:
-            if callback in self._listeners:
-                self._listeners.remove(callback)
-            _LOGGER.debug("Removed listener from coordinator for site %s", self.site_id)
-
-        return _remove
-
-    def channel_value(self, channel: str, key: str) -> Any:
-        """Return the requested field for a given channel."""
-        channel_data = self._channel_cache.get(channel)
-        #_LOGGER.debug("Channel %s missing for site %s", channel, self.site_id)
-        if not channel_data:
-            _LOGGER.debug("Channel %s missing for site %s", channel, self.site_id)
-            return None
-        return channel_data.get(key)
-
-    def last_price_payload(self) -> dict[str, Any] | None:
-        """Expose the raw data for other consumers if needed."""
-        return self.data
-
-    def last_update_at(self) -> datetime | None:
-        """Return when the most recent payload was received."""
-        return self._last_update
-
-    def tariff_value(self, channel: str, key: str) -> Any:
-        """Return tariffInformation.* fields when present."""
-        channel_data = self._channel_cache.get(channel)
-        if not channel_data:
-            return None
-        tariff = channel_data.get("tariffInformation") or {}
-        return tariff.get(key)
+        if reset_cycle != RESET_NEVER:
+            self._unsub_costs.append(
+                async_track_time_change(self.hass, self._reset_costs, hour=0, minute=0, second=0)
+            )
+
+    @callback
+    def _reset_costs(self, now: datetime) -> None:
+        start = cycle_start(now, self._cost_reset_cycle)
+        if start is None:
+            return
+        reset = {channel for channel, cost in self._costs.items() if cost.last_reset < start}
+        for channel in reset:
+            self._costs[channel].reset(dt_util.utcnow(), start)
+        if reset:
+            self._save()
+            self._notify({(channel, COST_KEY) for channel in reset})
+
+    def _save(self) -> None:
+        # async_delay_save restarts its timer on every call, and frames or power
+        # changes arrive faster than the delay; schedule once and let the write
+        # collect whatever is current by then.
+        if self._store is not None and not self._save_pending:
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+
+    def _import_statistics(self, channel: str, history: PriceHistory, open_start: float) -> None:
+        """Import the hours completed before the open interval's hour, once each."""
+        open_hour = hour_floor(open_start)
+        since = self._statistics_through.get(channel, 0.0)
+        if since >= open_hour:
+            return
+        self.statistics_imported += async_import_hours(
+            self.hass, self.site_id, channel, history, since, open_hour
+        )
+        self._statistics_through[channel] = open_hour
+
+    def _schedule_expiry(self, channel_cache: dict[str, ChannelPrice]) -> set[FieldKey]:
+        """Arm an expiry for each channel's interval and return channels whose state flipped."""
+        if self.restored:
+            # Restored intervals have usually ended by the time Home Assistant is back;
+            # they keep their value, flagged stale, until the first live frame.
+            return set()
+        now = dt_util.utcnow()
+        grace = timedelta(seconds=PRICE_EXPIRY_GRACE)
+        expired: set[str] = set()
+        for channel, price in channel_cache.items():
+            key = (self.site_id, channel)
+            if price.end_time is None:
+                self._scheduler.async_cancel(key)
+            elif price.end_time + grace <= now:
+                self._scheduler.async_cancel(key)
+                expired.add(channel)
+            else:
+                self._scheduler.async_schedule(
+                    key, price.end_time + grace, self._expiry_callback(channel)
+                )
+        for channel in self._channel_cache.keys() - channel_cache.keys():
+            self._scheduler.async_cancel((self.site_id, channel))
+        flipped = expired ^ (self._expired & channel_cache.keys())
+        self._expired = expired
+        return {(channel, EXPIRY_KEY) for channel in flipped}
+
+    def _expiry_callback(self, channel: str) -> Callable[[], None]:
+        action = self._expiry_callbacks.get(channel)
+        if action is not None:
+            return action
+
+        def _expire() -> None:
+            if channel in self._expired:
+                return
+            self._expired.add(channel)
+            _LOGGER.debug("Site %s %s interval expired without a new price", self.site_id, channel)
+            self._notify({(channel, EXPIRY_KEY)})
+
+        self._expiry_callbacks[channel] = _expire
+        return _expire
+
+    def event_counts(self) -> dict[str, int]:
+        """Return how many bus events were fired or suppressed and their estimated size."""
+        return {
+            "fired": self.events_fired,
+            "suppressed": self.events_suppressed,
+            "bytes": self.event_bytes,
+            "suppressed_bytes": self.suppressed_bytes,
+        }
+
+    def channel_expired(self, channel: str) -> bool:
+        """Return whether a channel's current interval ended without a newer price."""
+        return channel in self._expired
+
+    def cost(self, channel: str) -> CostAccumulator | None:
+        """Return the running energy cost for a channel, if one is tracked."""
+        return self._costs.get(channel)
+
+
+def _power_kw(state: State | None) -> float | None:
+    """Return a power sensor's reading in kW, or ``None`` when it is unusable."""
+    if state is None or state.state in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+        return None
+    scale = POWER_TO_KW.get(state.attributes.get(ATTR_UNIT_OF_MEASUREMENT))
+    if scale is None:
+        return None
+    try:
+        return float(state.state) * scale
+    except ValueError:
+        return None
@@ -0,0 +1,86 @@
+"""Running energy cost integrated from a power entity and the live price."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.const import UnitOfPower
+from homeassistant.util import dt as dt_util
+
+RESET_DAILY = "daily"
+RESET_WEEKLY = "weekly"
+RESET_MONTHLY = "monthly"
+RESET_NEVER = "never"
+RESET_CYCLES = [RESET_DAILY, RESET_WEEKLY, RESET_MONTHLY, RESET_NEVER]
+
+# Multipliers converting a power state into kilowatts.
+POWER_TO_KW: dict[str, float] = {
+    UnitOfPower.WATT: 0.001,
+    UnitOfPower.KILO_WATT: 1.0,
+    "MW": 1000.0,
+}
+
+
+def cycle_start(now: datetime, cycle: str) -> datetime | None:
+    """Return the local start of the reset cycle holding ``now``."""
+    # start_of_local_day takes the date as given, so a UTC ``now`` would use the UTC day.
+    midnight = dt_util.start_of_local_day(dt_util.as_local(now))
+    if cycle == RESET_DAILY:
+        return midnight
+    if cycle == RESET_WEEKLY:
+        return dt_util.start_of_local_day(midnight.date() - timedelta(days=midnight.weekday()))
+    if cycle == RESET_MONTHLY:
+        return dt_util.start_of_local_day(midnight.date().replace(day=1))
+    return None
+
+
+class CostAccumulator:
+    """Integrate power x price into a running cost in cents, O(1) per update.
+
+    Power is held as a step between samples, so each update adds the energy
+    used since the previous one at the price that applied over that span.
+    """
+
+    __slots__ = ("total", "last_reset", "_power_kw", "_price", "_last")
+
+    def __init__(self, total: float = 0.0, last_reset: datetime | None = None) -> None:
+        self.total = total
+        self.last_reset = last_reset or dt_util.utcnow()
+        self._power_kw: float | None = None
+        self._price: float | None = None
+        self._last: datetime | None = None
+
+    def _advance(self, now: datetime) -> None:
+        if self._last is not None and self._power_kw is not None and self._price is not None:
+            hours = (now - self._last).total_seconds() / 3600
+            if hours > 0:
+                self.total += self._power_kw * hours * self._price
+        self._last = now
+
+    def set_power(self, power_kw: float | None, now: datetime) -> None:
+        """Record a new power reading; ``None`` pauses integration."""
+        self._advance(now)
+        self._power_kw = power_kw
+
+    def set_price(self, price: float | None, now: datetime) -> None:
+        """Record a new price in c/kWh."""
+        self._advance(now)
+        self._price = price
+
+    def reset(self, now: datetime, at: datetime | None = None) -> None:
+        """Start a new cycle, closing the running span at ``now``."""
+        self._advance(now)
+        self.total = 0.0
+        self.last_reset = at or now
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the persisted part of the accumulator."""
+        return {"total": self.total, "last_reset": self.last_reset.isoformat()}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> CostAccumulator:
+        """Rebuild an accumulator saved by :meth:`as_dict`."""
+        return cls(
+            float(data.get("total") or 0.0),
+            dt_util.parse_datetime(data.get("last_reset") or ""),
+        )
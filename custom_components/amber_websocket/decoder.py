@@ -0,0 +1,61 @@
+"""JSON decoding backends for Amber websocket frames."""
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with Home Assistant
+    orjson = None
+
+Frame = str | bytes | bytearray | memoryview
+
+
+@dataclass(slots=True, frozen=True)
+class PayloadDecoder:
+    """A named JSON backend and the exceptions it raises on bad input."""
+
+    name: str
+    loads: Callable[[Frame], Any]
+    dumps: Callable[[Any], str]
+    errors: tuple[type[Exception], ...]
+
+
+def _stdlib_loads(frame: Frame) -> Any:
+    if isinstance(frame, memoryview):
+        # json.loads cannot read a memoryview, so this backend has to copy.
+        frame = frame.tobytes()
+    return json.loads(frame)
+
+
+STDLIB_DECODER = PayloadDecoder(
+    name="json",
+    loads=_stdlib_loads,
+    dumps=json.dumps,
+    errors=(ValueError, UnicodeDecodeError),
+)
+
+if orjson is not None:
+    ORJSON_DECODER: PayloadDecoder | None = PayloadDecoder(
+        name="orjson",
+        # orjson reads str, bytes, bytearray and memoryview without an extra copy.
+        loads=orjson.loads,
+        dumps=lambda obj: orjson.dumps(obj).decode(),
+        errors=(orjson.JSONDecodeError, UnicodeDecodeError),
+    )
+else:
+    ORJSON_DECODER = None
+
+DECODERS: dict[str, PayloadDecoder] = {
+    decoder.name: decoder for decoder in (ORJSON_DECODER, STDLIB_DECODER) if decoder
+}
+
+
+def get_decoder(name: str | None = None) -> PayloadDecoder:
+    """Return the named backend, or the fastest one available."""
+    if name is not None:
+        return DECODERS[name]
+    return ORJSON_DECODER or STDLIB_DECODER
@@ -0,0 +1,109 @@
+"""Device triggers for Amber price threshold crossings."""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.components.device_automation import DEVICE_TRIGGER_BASE_SCHEMA
+from homeassistant.components.device_automation.exceptions import InvalidDeviceAutomationConfig
+from homeassistant.const import CONF_DEVICE_ID, CONF_DOMAIN, CONF_PLATFORM, CONF_TYPE
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
+from homeassistant.helpers.typing import ConfigType
+
+from .const import CHANNEL_CONTROLLED_LOAD, CHANNEL_FEED_IN, CHANNEL_GENERAL, DOMAIN
+from .coordinator import async_get_thresholds
+from .thresholds import SPIKE_STATUSES, TRIGGER_SPIKE_CHANGED, TRIGGER_TYPES
+
+CONF_SUBTYPE = "subtype"
+CONF_THRESHOLD = "threshold"
+CONF_TO = "to"
+
+TRIGGER_CHANNELS = [CHANNEL_GENERAL, CHANNEL_FEED_IN, CHANNEL_CONTROLLED_LOAD]
+
+TRIGGER_SCHEMA = DEVICE_TRIGGER_BASE_SCHEMA.extend(
+    {
+        vol.Required(CONF_TYPE): vol.In(TRIGGER_TYPES),
+        vol.Required(CONF_SUBTYPE): vol.In(TRIGGER_CHANNELS),
+        vol.Optional(CONF_THRESHOLD): vol.Coerce(float),
+        vol.Optional(CONF_TO): vol.In(SPIKE_STATUSES),
+    }
+)
+
+
+def _site_id(hass: HomeAssistant, device_id: str) -> str:
+    device = dr.async_get(hass).async_get(device_id)
+    for domain, identifier in device.identifiers if device else ():
+        if domain == DOMAIN:
+            return identifier
+    raise InvalidDeviceAutomationConfig(f"Device {device_id} is not an Amber site")
+
+
+async def async_validate_trigger_config(hass: HomeAssistant, config: ConfigType) -> ConfigType:
+    """Validate a trigger config; price triggers need a threshold."""
+    config = TRIGGER_SCHEMA(config)
+    if config[CONF_TYPE] != TRIGGER_SPIKE_CHANGED and CONF_THRESHOLD not in config:
+        raise InvalidDeviceAutomationConfig(f"{config[CONF_TYPE]} requires a threshold")
+    return config
+
+
+async def async_get_triggers(hass: HomeAssistant, device_id: str) -> list[dict[str, Any]]:
+    """List every trigger type for every channel of an Amber site device."""
+    return [
+        {
+            CONF_PLATFORM: "device",
+            CONF_DOMAIN: DOMAIN,
+            CONF_DEVICE_ID: device_id,
+            CONF_TYPE: trigger_type,
+            CONF_SUBTYPE: channel,
+        }
+        for trigger_type in TRIGGER_TYPES
+        for channel in TRIGGER_CHANNELS
+    ]
+
+
+async def async_get_trigger_capabilities(
+    hass: HomeAssistant, config: ConfigType
+) -> dict[str, vol.Schema]:
+    """Return the threshold or spike status field a trigger takes."""
+    if config[CONF_TYPE] == TRIGGER_SPIKE_CHANGED:
+        fields = {vol.Optional(CONF_TO): vol.In(SPIKE_STATUSES)}
+    else:
+        fields = {vol.Required(CONF_THRESHOLD): vol.Coerce(float)}
+    return {"extra_fields": vol.Schema(fields)}
+
+
+async def async_attach_trigger(
+    hass: HomeAssistant,
+    config: ConfigType,
+    action: TriggerActionType,
+    trigger_info: TriggerInfo,
+) -> CALLBACK_TYPE:
+    """Register a trigger in the site's threshold index."""
+    site_id = _site_id(hass, config[CONF_DEVICE_ID])
+    trigger_type = config[CONF_TYPE]
+    value = config.get(CONF_TO if trigger_type == TRIGGER_SPIKE_CHANGED else CONF_THRESHOLD)
+    job = HassJob(action)
+
+    @callback
+    def _fire(data: dict[str, Any]) -> None:
+        hass.async_run_hass_job(
+            job,
+            {
+                "trigger": {
+                    **trigger_info["trigger_data"],
+                    **data,
+                    CONF_PLATFORM: "device",
+                    CONF_DOMAIN: DOMAIN,
+                    CONF_DEVICE_ID: config[CONF_DEVICE_ID],
+                    CONF_TYPE: trigger_type,
+                    CONF_SUBTYPE: config[CONF_SUBTYPE],
+                    "description": f"Amber {data['channel']} {trigger_type}",
+                }
+            },
+        )
+
+    return async_get_thresholds(hass, site_id).async_add(
+        config[CONF_SUBTYPE], trigger_type, value, _fire
+    )
@@ -0,0 +1,62 @@
+"""Diagnostics support for Amber WebSocket."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_AUTH_TOKEN, DOMAIN
+from .scheduler import async_get_scheduler
+
+TO_REDACT = {CONF_AUTH_TOKEN}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    stored = hass.data[DOMAIN][entry.entry_id]
+    client = stored["client"]
+    coordinator = stored["coordinator"]
+    last_update = coordinator.last_update_at()
+    scheduler = async_get_scheduler(hass)
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "client": {
+            "sites": client.site_ids,
+            "queue_depth": client.queue_depth,
+            "compression_requested": client.compression,
+            "metrics": client.metrics.as_dict(),
+        },
+        "coordinator": {
+            "site_id": coordinator.site_id,
+            "last_update": last_update.isoformat() if last_update else None,
+            "channels": sorted(coordinator.channels()),
+            "updates": coordinator.update_counts(),
+            "events": coordinator.event_counts(),
+            "statistics_imported": coordinator.statistics_imported,
+            "thresholds_fired": coordinator.thresholds_fired,
+            "history": coordinator.history_sizes(),
+            "forecast": coordinator.forecast_sizes(),
+            "expired_channels": [
+                channel
+                for channel in sorted(coordinator.channels())
+                if coordinator.channel_expired(channel)
+            ],
+            "costs": {
+                channel: cost.as_dict()
+                for channel in coordinator.channels()
+                if (cost := coordinator.cost(channel)) is not None
+            },
+        },
+        "scheduler": {
+            "pending": len(scheduler),
+            "fired": scheduler.fired,
+            "wakeups": scheduler.wakeups,
+        },
+    }
@@ -0,0 +1,38 @@
+"""Latest-wins hand-off between the socket reader and payload consumers."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+
+class LatestWinsQueue:
+    """Hold at most one pending item per key; a newer item replaces the older one.
+
+    The reader never waits on consumers: ``put`` is synchronous and the queue is
+    bounded by the number of distinct keys (sites).
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[str, Any] = {}
+        self._ready = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def put(self, key: str, item: Any) -> bool:
+        """Queue ``item`` for ``key``; return True if it replaced an unconsumed item."""
+        replaced = key in self._pending
+        self._pending[key] = item
+        self._ready.set()
+        return replaced
+
+    def discard(self, key: str) -> None:
+        """Drop any pending item for ``key``."""
+        self._pending.pop(key, None)
+
+    async def get_batch(self) -> dict[str, Any]:
+        """Wait for pending items and take all of them."""
+        await self._ready.wait()
+        self._ready.clear()
+        batch, self._pending = self._pending, {}
+        return batch
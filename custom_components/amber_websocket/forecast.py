@@ -0,0 +1,140 @@
+"""Per-channel forecast intervals and cheapest-window search."""
+from __future__ import annotations
+
+import heapq
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from typing import Any
+
+from .models import _to_datetime, _to_float
+
+INTERVAL_CURRENT = "CurrentInterval"
+INTERVAL_FORECAST = "ForecastInterval"
+
+
+class ChannelForecast:
+    """Current and forecast intervals for one channel, sorted by start time.
+
+    Starts, ends and prices live in contiguous ``array('d')`` columns. Window
+    results are cached on the instance, which is replaced by the next forecast
+    frame, so the cache never outlives the data it was computed from.
+    """
+
+    __slots__ = ("channel", "starts", "ends", "prices", "_prefix", "_gaps", "_cache")
+
+    def __init__(
+        self, channel: str, rows: Iterable[tuple[float, float, float]]
+    ) -> None:
+        self.channel = channel
+        self.starts = array("d")
+        self.ends = array("d")
+        self.prices = array("d")
+        for start, end, price in sorted(rows):
+            if self.starts and start == self.starts[-1]:
+                continue
+            self.starts.append(start)
+            self.ends.append(end)
+            self.prices.append(price)
+        # prefix[i] is the sum of prices[:i]; gaps[i] counts breaks in time before interval i.
+        self._prefix = array("d", [0.0])
+        self._gaps = array("l", [0])
+        for index, price in enumerate(self.prices):
+            self._prefix.append(self._prefix[-1] + price)
+            broken = index > 0 and self.starts[index] != self.ends[index - 1]
+            self._gaps.append(self._gaps[-1] + broken)
+        self._cache: dict[tuple[int, int, bool], dict[str, Any] | None] = {}
+
+    @classmethod
+    def from_entries(
+        cls, channel: str, entries: Iterable[dict[str, Any]], *, invert_price: bool = False
+    ) -> ChannelForecast:
+        """Build a forecast from raw ``prices`` entries for one channel."""
+        rows = []
+        for entry in entries:
+            start = _to_datetime(entry.get("startTime"))
+            end = _to_datetime(entry.get("endTime"))
+            price = _to_float(entry.get("perKwh"))
+            if start is None or end is None or price is None:
+                continue
+            rows.append((start.timestamp(), end.timestamp(), -price if invert_price else price))
+        return cls(channel, rows)
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def same_intervals(self, other: ChannelForecast | None) -> bool:
+        """Return whether ``other`` holds exactly the same intervals and prices."""
+        return (
+            other is not None
+            and self.prices == other.prices
+            and self.starts == other.starts
+            and self.ends == other.ends
+        )
+
+    def cheapest_window(
+        self, intervals: int, *, contiguous: bool = True, now: float
+    ) -> dict[str, Any] | None:
+        """Return the lowest-cost block of ``intervals`` intervals ending after ``now``.
+
+        Contiguous blocks are found with prefix sums in O(n); non-contiguous
+        ones pick the cheapest intervals with a bounded heap in O(n log k).
+        Returns ``None`` when not enough future intervals are known.
+        """
+        first = bisect_right(self.ends, now)
+        key = (intervals, first, contiguous)
+        if key not in self._cache:
+            if contiguous:
+                chosen = self._cheapest_contiguous(intervals, first)
+            else:
+                chosen = self._cheapest_any(intervals, first)
+            self._cache[key] = None if chosen is None else self._describe(chosen, contiguous)
+        return self._cache[key]
+
+    def _cheapest_contiguous(self, intervals: int, first: int) -> list[int] | None:
+        prefix = self._prefix
+        gaps = self._gaps
+        best: int | None = None
+        best_total = 0.0
+        for start in range(first, len(self.prices) - intervals + 1):
+            end = start + intervals
+            if gaps[end] != gaps[start + 1]:
+                continue
+            total = prefix[end] - prefix[start]
+            if best is None or total < best_total:
+                best, best_total = start, total
+        if best is None:
+            return None
+        return list(range(best, best + intervals))
+
+    def _cheapest_any(self, intervals: int, first: int) -> list[int] | None:
+        if len(self.prices) - first < intervals:
+            return None
+        chosen = heapq.nsmallest(
+            intervals, range(first, len(self.prices)), key=self.prices.__getitem__
+        )
+        return sorted(chosen)
+
+    def _describe(self, chosen: list[int], contiguous: bool) -> dict[str, Any]:
+        total = sum(self.prices[index] for index in chosen)
+        return {
+            "channel": self.channel,
+            "contiguous": contiguous,
+            "start": _iso(self.starts[chosen[0]]),
+            "end": _iso(self.ends[chosen[-1]]),
+            "total_per_kwh": round(total, 5),
+            "average_per_kwh": round(total / len(chosen), 5),
+            "intervals": [
+                {
+                    "start": _iso(self.starts[index]),
+                    "end": _iso(self.ends[index]),
+                    "per_kwh": self.prices[index],
+                }
+                for index in chosen
+            ],
+        }
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
@@ -0,0 +1,184 @@
+"""Rolling per-channel price history with incremental window statistics."""
+from __future__ import annotations
+
+import math
+from array import array
+from collections import deque
+from collections.abc import Iterable, Mapping
+
+# Payload keys kept in the history.
+HISTORY_FIELDS: tuple[str, ...] = ("perKwh", "renewables")
+# Window name to span in seconds, measured back from the newest interval's start.
+HISTORY_WINDOWS: dict[str, float] = {"1h": 3600.0, "24h": 86400.0}
+# 24 hours of 5-minute intervals, plus the open one.
+HISTORY_CAPACITY = 24 * 12 + 1
+
+STAT_MEAN = "mean"
+STAT_MIN = "min"
+STAT_MAX = "max"
+
+_NAN = math.nan
+
+
+class _SlidingWindow:
+    """Running sum plus monotonic min/max deques over a span of committed slots."""
+
+    __slots__ = ("span", "first", "total", "count", "_lows", "_highs")
+
+    def __init__(self, span: float) -> None:
+        self.span = span
+        self.first = 0
+        self.total = 0.0
+        self.count = 0
+        # (sequence, value) pairs; values increase along _lows and decrease along _highs.
+        self._lows: deque[tuple[int, float]] = deque()
+        self._highs: deque[tuple[int, float]] = deque()
+
+    def push(self, seq: int, value: float) -> None:
+        if math.isnan(value):
+            return
+        self.total += value
+        self.count += 1
+        lows = self._lows
+        while lows and lows[-1][1] >= value:
+            lows.pop()
+        lows.append((seq, value))
+        highs = self._highs
+        while highs and highs[-1][1] <= value:
+            highs.pop()
+        highs.append((seq, value))
+
+    def pop_oldest(self, value: float) -> None:
+        seq = self.first
+        self.first += 1
+        if math.isnan(value):
+            return
+        self.total -= value
+        self.count -= 1
+        if self._lows and self._lows[0][0] == seq:
+            self._lows.popleft()
+        if self._highs and self._highs[0][0] == seq:
+            self._highs.popleft()
+
+    def stat(self, stat: str, pending: float) -> float | None:
+        has_pending = not math.isnan(pending)
+        if stat == STAT_MEAN:
+            count = self.count + has_pending
+            if not count:
+                return None
+            return (self.total + (pending if has_pending else 0.0)) / count
+        if stat == STAT_MIN:
+            candidates = [self._lows[0][1]] if self._lows else []
+        else:
+            candidates = [self._highs[0][1]] if self._highs else []
+        if has_pending:
+            candidates.append(pending)
+        if not candidates:
+            return None
+        return min(candidates) if stat == STAT_MIN else max(candidates)
+
+
+class PriceHistory:
+    """Fixed-capacity ring buffer of interval values, deduplicated by start time.
+
+    The newest interval is held open and updated in place while the feed keeps
+    revising it; it is committed to the ring once a later interval arrives.
+    Window statistics combine the committed slots with the open interval, so
+    every update is O(1) amortized.
+    """
+
+    __slots__ = ("capacity", "_starts", "_values", "_next", "_windows", "_open_start", "_open")
+
+    def __init__(self, capacity: int = HISTORY_CAPACITY) -> None:
+        self.capacity = capacity
+        self._starts = array("d", [_NAN]) * capacity
+        self._values = {field: array("d", [_NAN]) * capacity for field in HISTORY_FIELDS}
+        self._next = 0
+        self._windows = {
+            field: {name: _SlidingWindow(span) for name, span in HISTORY_WINDOWS.items()}
+            for field in HISTORY_FIELDS
+        }
+        self._open_start: float | None = None
+        self._open = dict.fromkeys(HISTORY_FIELDS, _NAN)
+
+    def __len__(self) -> int:
+        committed = min(self._next, self.capacity)
+        return committed + (self._open_start is not None)
+
+    def add(self, start: float, values: Mapping[str, float | None]) -> bool:
+        """Record values for the interval starting at ``start`` (epoch seconds).
+
+        Returns whether any window statistic may have changed.
+        """
+        incoming = {
+            field: _NAN if values.get(field) is None else float(values[field])
+            for field in HISTORY_FIELDS
+        }
+        if self._open_start is not None:
+            if start < self._open_start:
+                return False
+            if start == self._open_start:
+                if incoming == self._open:
+                    return False
+                self._open = incoming
+                return True
+            self._commit(self._open_start, self._open)
+            self._evict_before(start)
+        self._open_start = start
+        self._open = incoming
+        return True
+
+    def stat(self, field: str, window: str, stat: str) -> float | None:
+        """Return the mean, min or max of ``field`` over a named window."""
+        return self._windows[field][window].stat(stat, self._open[field])
+
+    def entries(self) -> list[list[float | None]]:
+        """Return ``[start, *values]`` rows oldest first, including the open interval."""
+        rows = []
+        for seq in range(max(0, self._next - self.capacity), self._next):
+            slot = seq % self.capacity
+            rows.append(
+                [self._starts[slot]]
+                + [_or_none(self._values[field][slot]) for field in HISTORY_FIELDS]
+            )
+        if self._open_start is not None:
+            rows.append([self._open_start] + [_or_none(self._open[f]) for f in HISTORY_FIELDS])
+        return rows
+
+    @classmethod
+    def from_entries(cls, rows: Iterable[list[float | None]]) -> PriceHistory:
+        """Rebuild a history from :meth:`entries` output."""
+        history = cls()
+        for start, *values in rows:
+            history.add(start, dict(zip(HISTORY_FIELDS, values)))
+        return history
+
+    def _commit(self, start: float, values: dict[str, float]) -> None:
+        seq = self._next
+        slot = seq % self.capacity
+        if seq >= self.capacity:
+            # The slot is about to be overwritten; drop it from any window still holding it.
+            for field, windows in self._windows.items():
+                for window in windows.values():
+                    while window.first <= seq - self.capacity:
+                        window.pop_oldest(self._values[field][window.first % self.capacity])
+        self._starts[slot] = start
+        for field, value in values.items():
+            self._values[field][slot] = value
+            for window in self._windows[field].values():
+                window.push(seq, value)
+        self._next = seq + 1
+
+    def _evict_before(self, newest_start: float) -> None:
+        starts = self._starts
+        capacity = self.capacity
+        for field, windows in self._windows.items():
+            column = self._values[field]
+            for window in windows.values():
+                cutoff = newest_start - window.span
+                while window.first < self._next and starts[window.first % capacity] <= cutoff:
+                    window.pop_oldest(column[window.first % capacity])
+
+
+def _or_none(value: float) -> float | None:
+    return None if math.isnan(value) else value
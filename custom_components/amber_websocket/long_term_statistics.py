@@ -0,0 +1,94 @@
+"""Import completed price intervals into the recorder's long-term statistics."""
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from typing import Any
+
+from homeassistant.const import PERCENTAGE
+from homeassistant.core import HomeAssistant
+
+from .const import CHANNEL_GENERAL, DOMAIN
+from .history import HISTORY_FIELDS, PriceHistory
+
+_LOGGER = logging.getLogger(__name__)
+
+HOUR = 3600.0
+
+# History field, statistic suffix, unit and whether every channel carries it.
+STATISTIC_FIELDS: tuple[tuple[str, str, str, bool], ...] = (
+    ("perKwh", "price", "c/kWh", True),
+    ("renewables", "renewables", PERCENTAGE, False),
+)
+
+
+def hour_floor(timestamp: float) -> float:
+    """Return the start of the UTC hour holding ``timestamp``."""
+    return timestamp - timestamp % HOUR
+
+
+def statistic_id(site_id: str, channel: str, suffix: str) -> str:
+    """Return the external statistic id for a site, channel and field."""
+    channel_id = "".join(f"_{char.lower()}" if char.isupper() else char for char in channel)
+    return f"{DOMAIN}:{site_id.lower()}_{channel_id}_{suffix}"
+
+
+def hourly_rows(
+    rows: Iterable[list[float | None]], column: int, since: float, until: float
+) -> list[dict[str, Any]]:
+    """Aggregate history rows into mean/min/max per hour in ``[since, until)``."""
+    buckets: dict[float, list[float]] = {}
+    for row in rows:
+        start, value = row[0], row[column]
+        if value is None or not since <= start < until:
+            continue
+        buckets.setdefault(hour_floor(start), []).append(value)
+    return [
+        {
+            "start": datetime.fromtimestamp(hour, tz=timezone.utc),
+            "mean": sum(values) / len(values),
+            "min": min(values),
+            "max": max(values),
+        }
+        for hour, values in sorted(buckets.items())
+    ]
+
+
+def async_import_hours(
+    hass: HomeAssistant,
+    site_id: str,
+    channel: str,
+    history: PriceHistory,
+    since: float,
+    until: float,
+) -> int:
+    """Import every complete hour between ``since`` and ``until``; return the rows sent."""
+    if "recorder" not in hass.config.components:
+        return 0
+    # Imported lazily so the recorder is only needed when the option is enabled.
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.recorder.models import StatisticMeanType
+    from homeassistant.components.recorder.statistics import async_add_external_statistics
+
+    rows = history.entries()
+    imported = 0
+    for field, suffix, unit, every_channel in STATISTIC_FIELDS:
+        if not every_channel and channel != CHANNEL_GENERAL:
+            continue
+        statistics = hourly_rows(rows, HISTORY_FIELDS.index(field) + 1, since, until)
+        if not statistics:
+            continue
+        metadata = {
+            # mean_type replaces the deprecated has_mean from Home Assistant 2025.4.
+            "mean_type": StatisticMeanType.ARITHMETIC,
+            "has_sum": False,
+            "name": f"Amber {site_id} {channel} {field}",
+            "source": DOMAIN,
+            "statistic_id": statistic_id(site_id, channel, suffix),
+            "unit_of_measurement": unit,
+        }
+        async_add_external_statistics(hass, metadata, statistics)
+        imported += len(statistics)
+    _LOGGER.debug("Site %s %s imported %s hourly statistics rows", site_id, channel, imported)
+    return imported
@@ -0,0 +1,240 @@
+"""Always-on counters and histograms for the websocket pipeline."""
+from __future__ import annotations
+
+import math
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+from typing import Any
+
+# Bucket upper bounds in milliseconds; values above the last bound land in an overflow bucket.
+LATENCY_BUCKETS_MS: tuple[float, ...] = (
+    0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000,
+)
+# Bucket upper bounds in milliseconds for connect-to-first-price times.
+FIRST_PRICE_BUCKETS_MS: tuple[float, ...] = (
+    100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 300000,
+)
+# Observations kept by a RollingWindow: a day of 5-minute intervals.
+ROLLING_WINDOW_SIZE = 288
+
+
+class Histogram:
+    """Fixed-bucket histogram whose buckets are allocated up front."""
+
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS_MS) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        """Add one observation."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, pct: float) -> float | None:
+        """Return the upper bound of the bucket holding the given percentile."""
+        if not self.count:
+            return None
+        target = self.count * pct / 100
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= target:
+                return self.bounds[index] if index < len(self.bounds) else self.max
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-friendly summary."""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "max": self.max if self.count else None,
+            "buckets": dict(zip([*map(str, self.bounds), "inf"], self.counts)),
+        }
+
+
+class RollingWindow:
+    """The most recent observations in a fixed-size ring, summarised on demand.
+
+    Recording is O(1) with no allocation once the ring is full; percentiles
+    sort a copy, which only happens when a sensor or diagnostics asks.
+    """
+
+    __slots__ = ("size", "count", "_values", "_next")
+
+    def __init__(self, size: int = ROLLING_WINDOW_SIZE) -> None:
+        self.size = size
+        self.count = 0
+        self._values = array("d")
+        self._next = 0
+
+    def record(self, value: float) -> None:
+        """Add one observation, replacing the oldest once the window is full."""
+        if len(self._values) < self.size:
+            self._values.append(value)
+        else:
+            self._values[self._next] = value
+        self._next = (self._next + 1) % self.size
+        self.count += 1
+
+    def percentile(self, pct: float) -> float | None:
+        """Return the nearest-rank percentile of the observations in the window."""
+        if not self._values:
+            return None
+        ordered = sorted(self._values)
+        rank = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+        return ordered[rank]
+
+    def max(self) -> float | None:
+        """Return the largest observation in the window."""
+        return max(self._values) if self._values else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-friendly summary."""
+        return {
+            "count": self.count,
+            "window": len(self._values),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "max": self.max(),
+        }
+
+
+class ClientMetrics:
+    """Counters the websocket client updates on its hot path."""
+
+    __slots__ = (
+        "frames_received",
+        "decode_failures",
+        "reconnects",
+        "reconnect_causes",
+        "last_reconnect_cause",
+        "current_backoff",
+        "connected_since",
+        "connected_monotonic",
+        "last_frame_at",
+        "last_frame_monotonic",
+        "decode_ms",
+        "fanout_ms",
+        "first_price_ms",
+        "queue_ms",
+        "coalesced_frames",
+        "max_queue_depth",
+        "compression_window_bits",
+        "client_no_context_takeover",
+        "wire_bytes",
+        "payload_bytes",
+        "inflate_seconds",
+        "feed_lag_s",
+        "ping_rtt_ms",
+        "ping_timeouts",
+    )
+
+    def __init__(self) -> None:
+        self.frames_received = 0
+        self.decode_failures = 0
+        self.reconnects = 0
+        self.reconnect_causes: dict[str, int] = {}
+        self.last_reconnect_cause: str | None = None
+        self.current_backoff = 0.0
+        self.connected_since: float | None = None
+        self.connected_monotonic: float | None = None
+        self.last_frame_at: float | None = None
+        self.last_frame_monotonic: float | None = None
+        self.decode_ms = Histogram()
+        self.fanout_ms = Histogram()
+        self.first_price_ms = Histogram(FIRST_PRICE_BUCKETS_MS)
+        self.queue_ms = Histogram()
+        self.coalesced_frames = 0
+        self.max_queue_depth = 0
+        self.compression_window_bits = 0
+        self.client_no_context_takeover = False
+        self.wire_bytes = 0
+        self.payload_bytes = 0
+        self.inflate_seconds = 0.0
+        self.feed_lag_s = RollingWindow()
+        self.ping_rtt_ms = RollingWindow()
+        self.ping_timeouts = 0
+
+    def mark_connected(self) -> None:
+        """Record that a socket was opened."""
+        self.connected_since = time.time()
+        self.connected_monotonic = time.monotonic()
+        self.current_backoff = 0.0
+
+    def mark_compression(self, window_bits: int, client_no_context_takeover: bool) -> None:
+        """Record the permessage-deflate parameters negotiated for the current socket."""
+        self.compression_window_bits = window_bits
+        self.client_no_context_takeover = client_no_context_takeover
+
+    def mark_disconnected(self, cause: str, backoff: float) -> None:
+        """Record that the socket dropped and when the next attempt happens."""
+        self.connected_since = None
+        self.connected_monotonic = None
+        self.reconnects += 1
+        self.last_reconnect_cause = cause
+        self.reconnect_causes[cause] = self.reconnect_causes.get(cause, 0) + 1
+        self.current_backoff = backoff
+
+    def mark_frame(self) -> None:
+        """Record the arrival of a frame."""
+        self.frames_received += 1
+        self.last_frame_at = time.time()
+        self.last_frame_monotonic = time.monotonic()
+
+    def seconds_since_last_frame(self) -> float | None:
+        """Return how long ago the last frame arrived."""
+        if self.last_frame_monotonic is None:
+            return None
+        return time.monotonic() - self.last_frame_monotonic
+
+    def seconds_connected(self) -> float | None:
+        """Return how long the current socket has been open."""
+        if self.connected_monotonic is None:
+            return None
+        return time.monotonic() - self.connected_monotonic
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-friendly dump for diagnostics."""
+        return {
+            "frames_received": self.frames_received,
+            "decode_failures": self.decode_failures,
+            "reconnects": self.reconnects,
+            "reconnect_causes": dict(self.reconnect_causes),
+            "last_reconnect_cause": self.last_reconnect_cause,
+            "current_backoff": self.current_backoff,
+            "connected_since": self.connected_since,
+            "seconds_connected": self.seconds_connected(),
+            "last_frame_at": self.last_frame_at,
+            "seconds_since_last_frame": self.seconds_since_last_frame(),
+            "decode_ms": self.decode_ms.as_dict(),
+            "fanout_ms": self.fanout_ms.as_dict(),
+            "first_price_ms": self.first_price_ms.as_dict(),
+            "queue_ms": self.queue_ms.as_dict(),
+            "coalesced_frames": self.coalesced_frames,
+            "max_queue_depth": self.max_queue_depth,
+            "feed_lag_s": self.feed_lag_s.as_dict(),
+            "ping_rtt_ms": self.ping_rtt_ms.as_dict(),
+            "ping_timeouts": self.ping_timeouts,
+            "bandwidth": {
+                "compression_window_bits": self.compression_window_bits,
+                "client_no_context_takeover": self.client_no_context_takeover,
+                "wire_bytes": self.wire_bytes,
+                "payload_bytes": self.payload_bytes,
+                "compression_ratio": (
+                    round(self.payload_bytes / self.wire_bytes, 2) if self.wire_bytes else None
+                ),
+                "inflate_seconds": round(self.inflate_seconds, 6),
+            },
+        }
@@ -0,0 +1,145 @@
+"""Parsed price snapshots built from Amber websocket payloads."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+# Payload keys exposed by sensors, mapped to the ChannelPrice attribute holding them.
+FIELD_ATTRIBUTES: dict[str, str] = {
+    "perKwh": "per_kwh",
+    "spotPerKwh": "spot_per_kwh",
+    "renewables": "renewables",
+    "descriptor": "descriptor",
+    "spikeStatus": "spike_status",
+    "startTime": "start_time",
+    "endTime": "end_time",
+    "nemTime": "nem_time",
+    "tariffInformation": "tariff",
+}
+
+
+def _to_float(value: Any) -> float | None:
+    # Amber sends JSON numbers, so check the exact types first.
+    value_type = type(value)
+    if value_type is float:
+        return value
+    if value_type is int:
+        return float(value)
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _to_datetime(value: Any) -> datetime | None:
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+@dataclass(slots=True)
+class ChannelPrice:
+    """Current interval for one channel, parsed once per payload.
+
+    Treated as immutable once built. It is not declared frozen because a frozen
+    dataclass assigns every field through ``object.__setattr__``, which tripled
+    the construction cost on the per-frame path.
+    """
+
+    channel: str
+    per_kwh: float | None = None
+    spot_per_kwh: float | None = None
+    renewables: float | None = None
+    descriptor: str | None = None
+    spike_status: str | None = None
+    start_time: datetime | None = None
+    end_time: datetime | None = None
+    nem_time: datetime | None = None
+    tariff: dict[str, Any] = field(default_factory=dict)
+    # Raw startTime, endTime and nemTime strings the three datetimes were parsed from.
+    raw_times: tuple[Any, Any, Any] | None = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_payload(
+        cls,
+        channel: str,
+        data: dict[str, Any],
+        *,
+        invert_price: bool = False,
+        previous: ChannelPrice | None = None,
+    ) -> ChannelPrice:
+        """Build a snapshot from a raw ``prices`` entry.
+
+        Feed-in prices are inverted here so exports read as negative costs. The
+        interval times only change once per interval, so when they match
+        ``previous`` its parsed datetimes are reused instead of parsed again.
+        """
+        per_kwh = _to_float(data.get("perKwh"))
+        if invert_price and per_kwh is not None:
+            per_kwh = -per_kwh
+        raw_times = (data.get("startTime"), data.get("endTime"), data.get("nemTime"))
+        if previous is not None and previous.raw_times == raw_times:
+            start_time, end_time, nem_time = (
+                previous.start_time,
+                previous.end_time,
+                previous.nem_time,
+            )
+        else:
+            start_time = _to_datetime(raw_times[0])
+            end_time = _to_datetime(raw_times[1])
+            nem_time = _to_datetime(raw_times[2])
+        return cls(
+            channel=channel,
+            per_kwh=per_kwh,
+            spot_per_kwh=_to_float(data.get("spotPerKwh")),
+            renewables=_to_float(data.get("renewables")),
+            descriptor=data.get("descriptor"),
+            spike_status=data.get("spikeStatus"),
+            start_time=start_time,
+            end_time=end_time,
+            nem_time=nem_time,
+            tariff=data.get("tariffInformation") or {},
+            raw_times=raw_times,
+        )
+
+    def value(self, key: str) -> Any:
+        """Return the parsed value for a payload key such as ``perKwh``."""
+        attr = FIELD_ATTRIBUTES.get(key)
+        if attr is None:
+            return None
+        return getattr(self, attr)
+
+    def as_summary(self) -> dict[str, Any]:
+        """Return a compact JSON-friendly view used for events and streaming."""
+        return {
+            "per_kwh": self.per_kwh,
+            "spot_per_kwh": self.spot_per_kwh,
+            "renewables": self.renewables,
+            "descriptor": self.descriptor,
+            "spike_status": self.spike_status,
+            "start_time": self.start_time.isoformat() if self.start_time else None,
+            "end_time": self.end_time.isoformat() if self.end_time else None,
+        }
+
+    def changed_fields(self, other: ChannelPrice | None) -> list[str]:
+        """Return the payload keys whose values differ from ``other``."""
+        if other is None:
+            return list(FIELD_ATTRIBUTES)
+        return [
+            key
+            for key, attr in FIELD_ATTRIBUTES.items()
+            if getattr(self, attr) != getattr(other, attr)
+        ]
@@ -0,0 +1,351 @@
+"""Home-Assistant-free price state shared by the integration and the CLI."""
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterable
+from datetime import datetime, timezone
+from typing import Any
+
+from .const import (
+    CHANNEL_FEED_IN,
+    DEFAULT_PAYLOAD_TRACE_EVERY,
+    PAYLOAD_TRACE_CHANGES,
+    PAYLOAD_TRACE_OFF,
+)
+from .forecast import INTERVAL_FORECAST, ChannelForecast
+from .history import PriceHistory
+from .models import FIELD_ATTRIBUTES, ChannelPrice
+
+_LOGGER = logging.getLogger(__name__)
+
+FieldKey = tuple[str, str]
+
+# Pseudo field that changes with every frame and every connection status change.
+CONNECTION_KEY: FieldKey = ("connection", "metrics")
+
+# Pseudo source key that changes with a channel's rolling history statistics.
+HISTORY_KEY = "history"
+# Pseudo source key that changes when a channel receives new forecast intervals.
+FORECAST_KEY = "forecast"
+
+# Channels whose perKwh is inverted so exports read as negative costs.
+INVERTED_CHANNELS = frozenset({CHANNEL_FEED_IN})
+
+
+class PriceCoordinator:
+    """Parse one site's payloads into snapshots, history and forecasts.
+
+    Listeners are indexed by the ``(channel, source_key)`` pairs they depend on
+    so a payload only wakes the callbacks whose inputs changed. Subclasses hook
+    :meth:`_channels_applied` and :meth:`_payload_applied` to add persistence,
+    timers or events.
+    """
+
+    def __init__(self, websocket_client, site_id: str) -> None:
+        self._listeners: dict[Callable[[], None], None] = {}
+        self._field_listeners: dict[FieldKey, dict[Callable[[], None], None]] = {}
+        self._channel_listeners: dict[str, dict[Callable[[], None], None]] = {}
+        self._registrations = 0
+        self._shutdown_listeners: dict[Callable[[], None], None] = {}
+        self._channel_cache: dict[str, ChannelPrice] = {}
+        self._history: dict[str, PriceHistory] = {}
+        self._forecasts: dict[str, ChannelForecast] = {}
+        self.data: dict[str, Any] | None = None
+        self._last_update: datetime | None = None
+        self.site_id = site_id
+        self.updates_written = 0
+        self.updates_skipped = 0
+        self.trace_mode = PAYLOAD_TRACE_OFF
+        self.trace_every = DEFAULT_PAYLOAD_TRACE_EVERY
+        self.frames_applied = 0
+        self.client = websocket_client
+        self._unsub_client = websocket_client.add_listener(site_id, self._handle_payload)
+        self._unsub_status = websocket_client.add_status_listener(self._handle_client_status)
+        _LOGGER.debug("Coordinator initialised for site %s", site_id)
+
+    async def async_shutdown(self) -> None:
+        """Stop receiving payloads from the websocket client."""
+        self._unsub_client()
+        self._unsub_status()
+        listeners, self._shutdown_listeners = self._shutdown_listeners, {}
+        for callback in listeners:
+            callback()
+
+    def async_on_shutdown(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Register a callback that fires once when the coordinator shuts down."""
+        self._shutdown_listeners[callback] = None
+        return lambda: self._shutdown_listeners.pop(callback, None)
+
+    def _handle_payload(self, payload: dict[str, Any]) -> None:
+        changed = self._apply_payload(payload, datetime.now(timezone.utc))
+        self._payload_applied(payload, changed)
+        self.frames_applied += 1
+        if self.trace_mode != PAYLOAD_TRACE_OFF:
+            self._trace(changed)
+        self._notify(changed, notify_all=True)
+
+    def _trace(self, changed: set[FieldKey]) -> None:
+        """Log a sampled frame at INFO, without needing debug logging."""
+        if self.trace_mode != PAYLOAD_TRACE_CHANGES and self.frames_applied % self.trace_every:
+            return
+        fields = sorted(f"{channel}.{key}" for channel, key in changed if key in FIELD_ATTRIBUTES)
+        if self.trace_mode == PAYLOAD_TRACE_CHANGES and not fields:
+            return
+        _LOGGER.info(
+            "Site %s frame %s changed %s: %s",
+            self.site_id,
+            self.frames_applied,
+            fields,
+            self.channel_summaries(),
+        )
+
+    def _payload_applied(self, payload: dict[str, Any], changed: set[FieldKey]) -> None:
+        """Run after a live payload is applied, before listeners are notified."""
+
+    def _apply_payload(
+        self, payload: dict[str, Any], received_at: datetime | None
+    ) -> set[FieldKey]:
+        self.data = payload
+        self._last_update = received_at
+        prices = payload.get("data", {}).get("prices", [])
+        channel_cache: dict[str, ChannelPrice] = {}
+        current: dict[str, dict[str, Any]] = {}
+        forecasts: dict[str, list[dict[str, Any]]] = {}
+        for price in prices:
+            channel = price.get("channelType")
+            if not channel:
+                continue
+            if price.get("type") == INTERVAL_FORECAST:
+                forecasts.setdefault(channel, []).append(price)
+                continue
+            current[channel] = price
+            channel_cache[channel] = ChannelPrice.from_payload(
+                channel,
+                price,
+                invert_price=channel in INVERTED_CHANNELS,
+                previous=self._channel_cache.get(channel),
+            )
+        changed = _changed_fields(self._channel_cache, channel_cache)
+        changed.add(CONNECTION_KEY)
+        for channel, entries in forecasts.items():
+            if channel in current:
+                entries.append(current[channel])
+            forecast = ChannelForecast.from_entries(
+                channel, entries, invert_price=channel in INVERTED_CHANNELS
+            )
+            # Amber repeats the forecast in every frame; keep the old one and its
+            # window cache unless an interval or price actually moved.
+            if forecast.same_intervals(self._forecasts.get(channel)):
+                continue
+            self._forecasts[channel] = forecast
+            changed.add((channel, FORECAST_KEY))
+        for channel, price in channel_cache.items():
+            if price.start_time is None:
+                continue
+            history = self._history.get(channel)
+            if history is None:
+                history = self._history[channel] = PriceHistory()
+            if history.add(
+                price.start_time.timestamp(),
+                {"perKwh": price.per_kwh, "renewables": price.renewables},
+            ):
+                changed.add((channel, HISTORY_KEY))
+        changed.update(self._channels_applied(channel_cache))
+        self._channel_cache = channel_cache
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Site %s received %s channel price entries (%s changed fields)",
+                self.site_id,
+                len(self._channel_cache),
+                len(changed),
+            )
+            for channel, data in self._channel_cache.items():
+                _LOGGER.debug("Channel %s data: %s", channel, data)
+        return changed
+
+    def _channels_applied(self, channel_cache: dict[str, ChannelPrice]) -> set[FieldKey]:
+        """Return extra changed keys for a new snapshot, before it replaces the last one."""
+        return set()
+
+    def _handle_client_status(self) -> None:
+        self._notify({CONNECTION_KEY})
+
+    def _notify(self, changed: set[FieldKey], *, notify_all: bool = False) -> None:
+        # Ordered dict used as a set so a callback indexed under several keys runs once.
+        pending: dict[Callable[[], None], None] = {}
+        for key in changed:
+            listeners = self._field_listeners.get(key)
+            if listeners:
+                pending.update(listeners)
+        for channel in {channel for channel, _ in changed}:
+            listeners = self._channel_listeners.get(channel)
+            if listeners:
+                pending.update(listeners)
+        if notify_all:
+            pending.update(self._listeners)
+        for listener in pending:
+            listener()
+        written = len(pending)
+        skipped = self._registrations - written
+        self.updates_written += written
+        self.updates_skipped += skipped
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Site %s notified %s listeners, skipped %s unchanged",
+                self.site_id,
+                written,
+                skipped,
+            )
+
+    def async_add_listener(
+        self,
+        callback: Callable[[], None],
+        depends_on: Iterable[FieldKey] | None = None,
+    ) -> Callable[[], None]:
+        """Register a callback for state updates.
+
+        When ``depends_on`` lists ``(channel, source_key)`` pairs the callback only
+        fires for payloads that change at least one of them; otherwise it fires
+        for every payload.
+        """
+        if depends_on is None:
+            removers = [self._add_to_bucket(self._listeners, callback)]
+        else:
+            removers = [
+                self._add_indexed(self._field_listeners, key, callback)
+                for key in set(depends_on)
+            ]
+        return self._track(removers)
+
+    def async_add_channel_listener(
+        self, channel: str, callback: Callable[[], None]
+    ) -> Callable[[], None]:
+        """Register a callback that fires when any field of ``channel`` changes."""
+        return self._track([self._add_indexed(self._channel_listeners, channel, callback)])
+
+    def _track(self, removers: list[Callable[[], None]]) -> Callable[[], None]:
+        self._registrations += 1
+        _LOGGER.debug("Added listener to coordinator for site %s", self.site_id)
+        removed = False
+
+        def _remove() -> None:
+            nonlocal removed
+            if removed:
+                return
+            removed = True
+            self._registrations -= 1
+            for remove in removers:
+                remove()
+            _LOGGER.debug("Removed listener from coordinator for site %s", self.site_id)
+
+        return _remove
+
+    def _add_indexed(
+        self,
+        index: dict[Any, dict[Callable[[], None], None]],
+        key: Any,
+        callback: Callable[[], None],
+    ) -> Callable[[], None]:
+        bucket = index.setdefault(key, {})
+
+        def _drop_empty() -> None:
+            if index.get(key) is bucket:
+                del index[key]
+
+        return self._add_to_bucket(bucket, callback, _drop_empty)
+
+    def _add_to_bucket(
+        self,
+        bucket: dict[Callable[[], None], None],
+        callback: Callable[[], None],
+        on_empty: Callable[[], None] | None = None,
+    ) -> Callable[[], None]:
+        bucket[callback] = None
+
+        def _remove() -> None:
+            bucket.pop(callback, None)
+            if not bucket and on_empty is not None:
+                on_empty()
+
+        return _remove
+
+    def set_trace(self, mode: str, every: int = DEFAULT_PAYLOAD_TRACE_EVERY) -> None:
+        """Log every ``every``-th frame (``sampled``) or frames that changed a price field."""
+        self.trace_mode = mode
+        self.trace_every = max(1, every)
+
+    def update_counts(self) -> dict[str, int]:
+        """Return how many listener notifications were written versus skipped."""
+        return {"written": self.updates_written, "skipped": self.updates_skipped}
+
+    def channels(self) -> list[str]:
+        """Return the channels present in the latest payload."""
+        return list(self._channel_cache)
+
+    def channel_price(self, channel: str) -> ChannelPrice | None:
+        """Return the parsed snapshot for a channel, if one has been received."""
+        return self._channel_cache.get(channel)
+
+    def channel_summaries(self) -> dict[str, dict[str, Any]]:
+        """Return a compact JSON-friendly summary of every channel."""
+        return {channel: price.as_summary() for channel, price in self._channel_cache.items()}
+
+    def channel_value(self, channel: str, key: str) -> Any:
+        """Return the requested field for a given channel."""
+        channel_data = self._channel_cache.get(channel)
+        if not channel_data:
+            _LOGGER.debug("Channel %s missing for site %s", channel, self.site_id)
+            return None
+        return channel_data.value(key)
+
+    def history_stat(self, channel: str, field: str, window: str, stat: str) -> float | None:
+        """Return a rolling mean/min/max of ``field`` for a channel over ``window``."""
+        history = self._history.get(channel)
+        if history is None:
+            return None
+        return history.stat(field, window, stat)
+
+    def forecast(self, channel: str) -> ChannelForecast | None:
+        """Return the latest current-plus-forecast intervals for a channel."""
+        return self._forecasts.get(channel)
+
+    def forecast_sizes(self) -> dict[str, int]:
+        """Return how many intervals the latest forecast holds per channel."""
+        return {channel: len(forecast) for channel, forecast in self._forecasts.items()}
+
+    def history_sizes(self) -> dict[str, int]:
+        """Return how many intervals are held per channel."""
+        return {channel: len(history) for channel, history in self._history.items()}
+
+    def last_price_payload(self) -> dict[str, Any] | None:
+        """Expose the raw data for other consumers if needed."""
+        return self.data
+
+    def last_update_at(self) -> datetime | None:
+        """Return when the most recent payload was received."""
+        return self._last_update
+
+    def tariff_value(self, channel: str, key: str) -> Any:
+        """Return tariffInformation.* fields when present."""
+        channel_data = self._channel_cache.get(channel)
+        if not channel_data:
+            return None
+        return channel_data.tariff.get(key)
+
+
+def _changed_fields(
+    previous: dict[str, ChannelPrice], current: dict[str, ChannelPrice]
+) -> set[FieldKey]:
+    """Return the ``(channel, source_key)`` pairs that differ between two snapshots."""
+    changed: set[FieldKey] = set()
+    for channel in previous.keys() | current.keys():
+        old = previous.get(channel)
+        new = current.get(channel)
+        if old == new:
+            continue
+        if new is None:
+            keys = old.changed_fields(None)
+        else:
+            keys = new.changed_fields(old)
+        changed.update((channel, key) for key in keys)
+    return changed
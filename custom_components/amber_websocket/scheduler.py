@@ -0,0 +1,124 @@
+"""One shared timer that expires price intervals for every site and channel."""
+from __future__ import annotations
+
+import heapq
+import logging
+from collections.abc import Callable, Hashable
+from datetime import datetime
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_SCHEDULER
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> ExpiryScheduler:
+    """Return the scheduler shared by every config entry."""
+    scheduler: ExpiryScheduler | None = hass.data.get(DATA_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_SCHEDULER] = ExpiryScheduler(hass)
+    return scheduler
+
+
+class ExpiryScheduler:
+    """Run callbacks at deadlines from a min-heap with a single armed timer.
+
+    Each key holds at most one deadline. Rescheduling or cancelling a key
+    leaves its old heap entry in place; entries that no longer match the
+    key's current deadline are skipped when they reach the top.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._heap: list[tuple[float, int, Hashable]] = []
+        self._deadlines: dict[Hashable, tuple[float, Callable[[], None]]] = {}
+        self._sequence = 0
+        self._unsub: CALLBACK_TYPE | None = None
+        self._armed_at: float | None = None
+        self.fired = 0
+        self.wakeups = 0
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    @callback
+    def async_schedule(self, key: Hashable, when: datetime, action: Callable[[], None]) -> None:
+        """Run ``action`` at ``when``, replacing any deadline already set for ``key``."""
+        timestamp = when.timestamp()
+        current = self._deadlines.get(key)
+        self._deadlines[key] = (timestamp, action)
+        if current is not None and current[0] == timestamp:
+            return
+        self._sequence += 1
+        heapq.heappush(self._heap, (timestamp, self._sequence, key))
+        if len(self._heap) > 2 * len(self._deadlines) + 16:
+            self._compact()
+        if self._armed_at is None or timestamp < self._armed_at:
+            self._arm(timestamp)
+        elif current is not None and current[0] == self._armed_at:
+            # The armed deadline just moved later; avoid a wakeup with nothing to do.
+            self._rearm()
+
+    def _rearm(self) -> None:
+        heap = self._heap
+        while heap and self._deadlines.get(heap[0][2], (None,))[0] != heap[0][0]:
+            heapq.heappop(heap)
+        if not heap:
+            self._disarm()
+        elif heap[0][0] != self._armed_at:
+            self._arm(heap[0][0])
+
+    @callback
+    def async_cancel(self, key: Hashable) -> None:
+        """Drop the deadline for ``key`` if one is set."""
+        self._deadlines.pop(key, None)
+        if not self._deadlines:
+            self._disarm()
+            self._heap.clear()
+
+    def _compact(self) -> None:
+        self._heap = [
+            entry
+            for entry in self._heap
+            if self._deadlines.get(entry[2], (None,))[0] == entry[0]
+        ]
+        heapq.heapify(self._heap)
+
+    def _arm(self, timestamp: float) -> None:
+        self._disarm()
+        self._armed_at = timestamp
+        self._unsub = async_track_point_in_utc_time(
+            self._hass, self._async_fire, dt_util.utc_from_timestamp(timestamp)
+        )
+
+    def _disarm(self) -> None:
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self._armed_at = None
+
+    @callback
+    def _async_fire(self, now: datetime) -> None:
+        self._unsub = None
+        self._armed_at = None
+        self.wakeups += 1
+        # ``now`` is the armed point in time; also run anything that fell due since.
+        deadline = max(now.timestamp(), dt_util.utcnow().timestamp())
+        heap = self._heap
+        due: list[Callable[[], None]] = []
+        while heap and heap[0][0] <= deadline:
+            timestamp, _, key = heapq.heappop(heap)
+            current = self._deadlines.get(key)
+            if current is None or current[0] != timestamp:
+                continue
+            del self._deadlines[key]
+            due.append(current[1])
+        self._rearm()
+        self.fired += len(due)
+        _LOGGER.debug("Expiry scheduler fired %s deadlines, %s pending", len(due), len(self))
+        for action in due:
+            action()
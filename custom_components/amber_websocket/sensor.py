@@ -2,7 +2,8 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
 from typing import Any, Callable
 
 from homeassistant.components.sensor import (
@@ -12,26 +13,35 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.util import dt as dt_util
 
 from .const import (
+    ATTR_RESTORED,
+    ATTR_STALE,
     CHANNEL_CONTROLLED_LOAD,
     CHANNEL_FEED_IN,
     CHANNEL_GENERAL,
     CONF_CHANNEL_CONTROLLED_LOAD,
     CONF_CHANNEL_FEED_IN,
     CONF_CHANNEL_GENERAL,
+    CONF_COMPACT_ENTITIES,
+    CONF_LONG_TERM_STATISTICS,
     CONF_SITE_ID,
+    DEFAULT_COMPACT_ENTITIES,
     DEFAULT_CONTROLLED_LOAD_ENABLED,
     DEFAULT_FEED_IN_ENABLED,
     DEFAULT_GENERAL_ENABLED,
+    DEFAULT_LONG_TERM_STATISTICS,
     DOMAIN,
+    POWER_ENTITY_OPTIONS,
 )
-from .coordinator import AmberCoordinator
+from .coordinator import COST_KEY, EXPIRY_KEY, AmberCoordinator
+from .history import HISTORY_WINDOWS, STAT_MAX, STAT_MEAN, STAT_MIN
+from .metrics import RollingWindow
+from .price_coordinator import CONNECTION_KEY, HISTORY_KEY, FieldKey
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -40,21 +50,10 @@ ValueTransform = Callable[[Any], Any]
 CoordinatorValueFn = Callable[[AmberCoordinator], Any]
 
 
-def _to_datetime(value: Any):
-    if not value:
+def _from_epoch(value: float | None) -> datetime | None:
+    if value is None:
         return None
-    parsed = dt_util.parse_datetime(value)
-    if parsed is None:
-        return None
-    if parsed.tzinfo is None:
-        parsed = dt_util.as_utc(parsed)
-    return parsed
-
-
-def _invert_if_number(value: Any):
-    if isinstance(value, (int, float)):
-        return value * -1
-    return value
+    return datetime.fromtimestamp(value, tz=timezone.utc)
 
 
 def _tariff_value(channel: str, field: str) -> CoordinatorValueFn:
@@ -69,10 +68,8 @@ def _channel_sensor_bundle(
     friendly_name: str,
     channel: str,
     *,
-    invert_price: bool = False,
     price_icon: str = "mdi:flash",
 ) -> tuple[AmberSensorEntityDescription, ...]:
-    price_transform = _invert_if_number if invert_price else None
     return (
         AmberSensorEntityDescription(
             key=f"{prefix}_per_kwh",
@@ -82,7 +79,6 @@ def _channel_sensor_bundle(
             state_class=SensorStateClass.MEASUREMENT,
             channel=channel,
             source_key="perKwh",
-            value_transform=price_transform,
         ),
         AmberSensorEntityDescription(
             key=f"{prefix}_descriptor",
@@ -98,7 +94,6 @@ def _channel_sensor_bundle(
             device_class=SensorDeviceClass.TIMESTAMP,
             channel=channel,
             source_key="startTime",
-            value_transform=_to_datetime,
         ),
         AmberSensorEntityDescription(
             key=f"{prefix}_end_time",
@@ -107,7 +102,6 @@ def _channel_sensor_bundle(
             device_class=SensorDeviceClass.TIMESTAMP,
             channel=channel,
             source_key="endTime",
-            value_transform=_to_datetime,
         ),
         AmberSensorEntityDescription(
             key=f"{prefix}_nem_time",
@@ -116,7 +110,6 @@ def _channel_sensor_bundle(
             device_class=SensorDeviceClass.TIMESTAMP,
             channel=channel,
             source_key="nemTime",
-            value_transform=_to_datetime,
         ),
     )
 
@@ -129,6 +122,9 @@ class AmberSensorEntityDescription(SensorEntityDescription):
     source_key: str | None = None
     value_transform: ValueTransform | None = None
     value_fn: CoordinatorValueFn | None = None
+    last_reset_fn: CoordinatorValueFn | None = None
+    depends_on: tuple[FieldKey, ...] | None = None
+    compact: bool = False
 
 
 GENERAL_SENSOR_DESCRIPTIONS: tuple[AmberSensorEntityDescription, ...] = (
@@ -194,7 +190,6 @@ GENERAL_SENSOR_DESCRIPTIONS: tuple[AmberSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.TIMESTAMP,
         channel=CHANNEL_GENERAL,
         source_key="startTime",
-        value_transform=_to_datetime,
     ),
     AmberSensorEntityDescription(
         key="general_end_time",
@@ -203,7 +198,6 @@ GENERAL_SENSOR_DESCRIPTIONS: tuple[AmberSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.TIMESTAMP,
         channel=CHANNEL_GENERAL,
         source_key="endTime",
-        value_transform=_to_datetime,
     ),
     AmberSensorEntityDescription(
         key="general_nem_time",
@@ -212,14 +206,13 @@ GENERAL_SENSOR_DESCRIPTIONS: tuple[AmberSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.TIMESTAMP,
         channel=CHANNEL_GENERAL,
         source_key="nemTime",
-        value_transform=_to_datetime,
     ),
 )
 
 SENSOR_DESCRIPTIONS: tuple[AmberSensorEntityDescription, ...] = (
     GENERAL_SENSOR_DESCRIPTIONS
     + _channel_sensor_bundle(
-        "feed_in", "Feed-in", CHANNEL_FEED_IN, invert_price=True, price_icon="mdi:solar-power"
+        "feed_in", "Feed-in", CHANNEL_FEED_IN, price_icon="mdi:solar-power"
     )
     + _channel_sensor_bundle(
         "controlled_load",
@@ -238,16 +231,231 @@ SENSOR_DESCRIPTIONS: tuple[AmberSensorEntityDescription, ...] = (
     )
 )
 
+# Payload fields a compact channel entity carries as attributes, and their names.
+COMPACT_ATTRIBUTES: dict[str, str] = {
+    "descriptor": "descriptor",
+    "spotPerKwh": "spot_per_kwh",
+    "renewables": "renewables",
+    "spikeStatus": "spike_status",
+    "startTime": "start_time",
+    "endTime": "end_time",
+    "nemTime": "nem_time",
+}
+# Attributes that change with most intervals, kept out of the recorder's state rows.
+COMPACT_UNRECORDED_ATTRIBUTES = frozenset(
+    {"spot_per_kwh", "renewables", "start_time", "end_time", "nem_time"}
+)
+
+_HISTORY_STAT_NAMES = {STAT_MEAN: "Average", STAT_MIN: "Min", STAT_MAX: "Max"}
+_HISTORY_STAT_KEYS = {STAT_MEAN: "avg", STAT_MIN: "min", STAT_MAX: "max"}
+
+
+def _history_sensors(
+    prefix: str,
+    friendly_name: str,
+    channel: str,
+    field: str,
+    unit: str,
+    icon: str,
+) -> tuple[AmberSensorEntityDescription, ...]:
+    def _value(window: str, stat: str) -> CoordinatorValueFn:
+        def _stat(coord: AmberCoordinator) -> Any:
+            return coord.history_stat(channel, field, window, stat)
+
+        return _stat
+
+    return tuple(
+        AmberSensorEntityDescription(
+            key=f"{prefix}_{window}_{_HISTORY_STAT_KEYS[stat]}",
+            name=f"Amber {friendly_name} {window} {_HISTORY_STAT_NAMES[stat]}",
+            icon=icon,
+            native_unit_of_measurement=unit,
+            state_class=SensorStateClass.MEASUREMENT,
+            suggested_display_precision=2,
+            entity_registry_enabled_default=False,
+            channel=channel,
+            depends_on=((channel, HISTORY_KEY),),
+            value_fn=_value(window, stat),
+        )
+        for window in HISTORY_WINDOWS
+        for stat in (STAT_MEAN, STAT_MIN, STAT_MAX)
+    )
 
-async def async_setup_entry(
-    hass: HomeAssistant,
-    entry: ConfigEntry,
-    async_add_entities: AddEntitiesCallback,
-) -> None:
-    """Set up Amber sensors based on a config entry."""
-    data = hass.data[DOMAIN][entry.entry_id]
-    coordinator: AmberCoordinator = data["coordinator"]
 
+HISTORY_SENSOR_DESCRIPTIONS: tuple[AmberSensorEntityDescription, ...] = (
+    _history_sensors(
+        "general_per_kwh", "General Price", CHANNEL_GENERAL, "perKwh", "c/kWh", "mdi:chart-line"
+    )
+    + _history_sensors(
+        "general_renewables",
+        "General Renewables",
+        CHANNEL_GENERAL,
+        "renewables",
+        PERCENTAGE,
+        "mdi:leaf",
+    )
+    + _history_sensors(
+        "feed_in_per_kwh", "Feed-in Price", CHANNEL_FEED_IN, "perKwh", "c/kWh", "mdi:chart-line"
+    )
+    + _history_sensors(
+        "controlled_load_per_kwh",
+        "Controlled Load Price",
+        CHANNEL_CONTROLLED_LOAD,
+        "perKwh",
+        "c/kWh",
+        "mdi:chart-line",
+    )
+)
+
+
+def _cost_sensor(prefix: str, friendly_name: str, channel: str) -> AmberSensorEntityDescription:
+    def _total(coord: AmberCoordinator) -> float | None:
+        cost = coord.cost(channel)
+        return None if cost is None else round(cost.total / 100, 4)
+
+    def _last_reset(coord: AmberCoordinator) -> datetime | None:
+        cost = coord.cost(channel)
+        return None if cost is None else cost.last_reset
+
+    return AmberSensorEntityDescription(
+        key=f"{prefix}_cost",
+        name=f"Amber {friendly_name} Cost",
+        icon="mdi:cash",
+        device_class=SensorDeviceClass.MONETARY,
+        native_unit_of_measurement="AUD",
+        # Monetary sensors cannot be total_increasing, and feed-in credits make it fall.
+        state_class=SensorStateClass.TOTAL,
+        suggested_display_precision=2,
+        channel=channel,
+        depends_on=((channel, COST_KEY),),
+        value_fn=_total,
+        last_reset_fn=_last_reset,
+    )
+
+
+COST_SENSOR_DESCRIPTIONS: tuple[AmberSensorEntityDescription, ...] = (
+    _cost_sensor("general", "General", CHANNEL_GENERAL),
+    _cost_sensor("feed_in", "Feed-in", CHANNEL_FEED_IN),
+)
+
+
+def _diagnostic_sensor(
+    key: str, name: str, icon: str, value_fn: CoordinatorValueFn, **kwargs: Any
+) -> AmberSensorEntityDescription:
+    return AmberSensorEntityDescription(
+        key=key,
+        name=name,
+        icon=icon,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        depends_on=(CONNECTION_KEY,),
+        value_fn=value_fn,
+        **kwargs,
+    )
+
+
+def _rolling_sensors(
+    key: str, name: str, attr: str, unit: str
+) -> tuple[AmberSensorEntityDescription, ...]:
+    """Build p50/p95/max sensors over one of the client's rolling windows."""
+    summaries: tuple[tuple[str, Callable[[RollingWindow], float | None]], ...] = (
+        ("p50", lambda window: window.percentile(50)),
+        ("p95", lambda window: window.percentile(95)),
+        ("max", RollingWindow.max),
+    )
+    return tuple(
+        _diagnostic_sensor(
+            f"{key}_{label}",
+            f"Amber {name} {label}",
+            "mdi:timer-outline",
+            lambda coord, summary=summary: summary(getattr(coord.client.metrics, attr)),
+            native_unit_of_measurement=unit,
+            state_class=SensorStateClass.MEASUREMENT,
+            suggested_display_precision=1,
+        )
+        for label, summary in summaries
+    )
+
+
+DIAGNOSTIC_SENSOR_DESCRIPTIONS: tuple[AmberSensorEntityDescription, ...] = (
+    _diagnostic_sensor(
+        "frames_received",
+        "Amber Frames Received",
+        "mdi:counter",
+        lambda coord: coord.client.metrics.frames_received,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    _diagnostic_sensor(
+        "decode_failures",
+        "Amber Decode Failures",
+        "mdi:alert-circle-outline",
+        lambda coord: coord.client.metrics.decode_failures,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    _diagnostic_sensor(
+        "reconnects",
+        "Amber Reconnects",
+        "mdi:lan-disconnect",
+        lambda coord: coord.client.metrics.reconnects,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    _diagnostic_sensor(
+        "last_reconnect_cause",
+        "Amber Last Reconnect Cause",
+        "mdi:lan-pending",
+        lambda coord: coord.client.metrics.last_reconnect_cause,
+    ),
+    _diagnostic_sensor(
+        "reconnect_backoff",
+        "Amber Reconnect Backoff",
+        "mdi:timer-sand",
+        lambda coord: coord.client.metrics.current_backoff,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+    ),
+    _diagnostic_sensor(
+        "connected_since",
+        "Amber Connected Since",
+        "mdi:lan-connect",
+        lambda coord: _from_epoch(coord.client.metrics.connected_since),
+        device_class=SensorDeviceClass.TIMESTAMP,
+    ),
+    _diagnostic_sensor(
+        "last_frame",
+        "Amber Last Frame",
+        "mdi:clock-fast",
+        lambda coord: _from_epoch(coord.client.metrics.last_frame_at),
+        device_class=SensorDeviceClass.TIMESTAMP,
+    ),
+    _diagnostic_sensor(
+        "coalesced_frames",
+        "Amber Coalesced Frames",
+        "mdi:layers-minus",
+        lambda coord: coord.client.metrics.coalesced_frames,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    _diagnostic_sensor(
+        "decode_latency_p95",
+        "Amber Decode Latency p95",
+        "mdi:timer-outline",
+        lambda coord: coord.client.metrics.decode_ms.percentile(95),
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    _diagnostic_sensor(
+        "fanout_latency_p95",
+        "Amber Fan-out Latency p95",
+        "mdi:timer-outline",
+        lambda coord: coord.client.metrics.fanout_ms.percentile(95),
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    *_rolling_sensors("feed_lag", "Feed Lag", "feed_lag_s", UnitOfTime.SECONDS),
+    *_rolling_sensors("ping_rtt", "Ping RTT", "ping_rtt_ms", UnitOfTime.MILLISECONDS),
+)
+
+
+def _enabled_descriptions(entry: ConfigEntry) -> list[AmberSensorEntityDescription]:
     include_general = entry.options.get(CONF_CHANNEL_GENERAL, DEFAULT_GENERAL_ENABLED)
     include_feed_in = entry.options.get(CONF_CHANNEL_FEED_IN, DEFAULT_FEED_IN_ENABLED)
     include_controlled_load = entry.options.get(
@@ -265,21 +473,92 @@ async def async_setup_entry(
             return include_controlled_load
         return True
 
-    filtered = [desc for desc in SENSOR_DESCRIPTIONS if _channel_allowed(desc)]
-
-    sensors = [
-        AmberPriceSensor(coordinator, entry, description)
-        for description in filtered
+    filtered = [
+        desc
+        for desc in SENSOR_DESCRIPTIONS + HISTORY_SENSOR_DESCRIPTIONS
+        if _channel_allowed(desc)
     ]
+    if entry.options.get(CONF_COMPACT_ENTITIES, DEFAULT_COMPACT_ENTITIES):
+        # Keep one price entity per channel and fold the channel's other fields into it.
+        filtered = [
+            replace(desc, compact=True) if desc.source_key == "perKwh" else desc
+            for desc in filtered
+            if not (desc.channel and desc.source_key) or desc.source_key == "perKwh"
+        ]
+    if entry.options.get(CONF_LONG_TERM_STATISTICS, DEFAULT_LONG_TERM_STATISTICS):
+        # Hourly statistics are imported by the coordinator instead of compiled from states.
+        filtered = [
+            replace(desc, state_class=None) if desc.source_key else desc for desc in filtered
+        ]
+    filtered.extend(
+        desc
+        for desc in COST_SENSOR_DESCRIPTIONS
+        if _channel_allowed(desc) and entry.options.get(POWER_ENTITY_OPTIONS[desc.channel])
+    )
+    filtered.extend(DIAGNOSTIC_SENSOR_DESCRIPTIONS)
     _LOGGER.debug(
-        "Creating %s Amber sensors for site %s (general=%s feed_in=%s controlled=%s)",
-        len(sensors),
+        "Amber sensors for site %s (general=%s feed_in=%s controlled=%s)",
         entry.data[CONF_SITE_ID],
         include_general,
         include_feed_in,
         include_controlled_load,
     )
-    async_add_entities(sensors)
+    return filtered
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Amber sensors based on a config entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    coordinator: AmberCoordinator = data["coordinator"]
+
+    sensors = {
+        description.key: _build_sensor(coordinator, entry, description)
+        for description in _enabled_descriptions(entry)
+    }
+    data["sensors"] = sensors
+    data["add_entities"] = async_add_entities
+    _LOGGER.debug("Creating %s Amber sensors for site %s", len(sensors), entry.data[CONF_SITE_ID])
+    async_add_entities(list(sensors.values()))
+
+
+async def async_apply_channel_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Add or remove sensors in place so they match the entry's channel options."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    sensors: dict[str, AmberPriceSensor] = data["sensors"]
+    wanted = {description.key: description for description in _enabled_descriptions(entry)}
+
+    for key in [key for key in sensors if key not in wanted]:
+        sensor = sensors.pop(key)
+        # Registry-disabled sensors were never added to the platform and have no hass.
+        if sensor.hass is not None:
+            await sensor.async_remove()
+
+    added = [
+        _build_sensor(data["coordinator"], entry, description)
+        for key, description in wanted.items()
+        if key not in sensors
+    ]
+    for sensor in added:
+        sensors[sensor.entity_description.key] = sensor
+    if added:
+        data["add_entities"](added)
+    _LOGGER.debug(
+        "Applied channel options for site %s: %s sensors active",
+        entry.data[CONF_SITE_ID],
+        len(sensors),
+    )
+
+
+def _build_sensor(
+    coordinator: AmberCoordinator, entry: ConfigEntry, description: AmberSensorEntityDescription
+) -> AmberPriceSensor:
+    if description.compact:
+        return AmberChannelSensor(coordinator, entry, description)
+    return AmberPriceSensor(coordinator, entry, description)
 
 
 class AmberPriceSensor(SensorEntity):
@@ -307,16 +586,48 @@ class AmberPriceSensor(SensorEntity):
         )
 
     async def async_added_to_hass(self) -> None:
-        self._unsub = self._coordinator.async_add_listener(self._handle_coordinator_update)
+        self._unsub = self._coordinator.async_add_listener(
+            self._handle_coordinator_update, self._depends_on()
+        )
         _LOGGER.debug("Sensor %s subscribed to coordinator", self.entity_id)
         self._handle_coordinator_update()
 
+    def _depends_on(self) -> tuple[FieldKey, ...] | None:
+        description = self.entity_description
+        depends_on = description.depends_on
+        if (
+            depends_on is None
+            and description.value_fn is None
+            and description.channel
+            and description.source_key
+        ):
+            depends_on = (
+                (description.channel, description.source_key),
+                (description.channel, EXPIRY_KEY),
+            )
+        return depends_on
+
     async def async_will_remove_from_hass(self) -> None:
         if self._unsub:
             self._unsub()
             self._unsub = None
             _LOGGER.debug("Sensor %s unsubscribed from coordinator", self.entity_id)
 
+    @property
+    def available(self) -> bool:
+        """Report current-interval sensors unavailable once their interval has expired."""
+        description = self.entity_description
+        if description.channel and description.source_key:
+            return not self._coordinator.channel_expired(description.channel)
+        return True
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Flag values restored from storage until a live frame replaces them."""
+        if self._coordinator.restored and self.entity_description.entity_category is None:
+            return {ATTR_RESTORED: True, ATTR_STALE: True}
+        return None
+
     def _handle_coordinator_update(self) -> None:
         description = self.entity_description
 
@@ -332,10 +643,38 @@ class AmberPriceSensor(SensorEntity):
 
         if value is not None and description.value_transform is not None:
             value = description.value_transform(value)
-        _LOGGER.debug(
-            "Sensor %s updated value: %s",
-            self.entity_id,
-            value,
-        )
+        if description.last_reset_fn is not None:
+            self._attr_last_reset = description.last_reset_fn(self._coordinator)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Sensor %s updated value: %s", self.entity_id, value)
         self._attr_native_value = value
         self.async_write_ha_state()
+
+
+class AmberChannelSensor(AmberPriceSensor):
+    """One channel's price, with the channel's other fields as attributes.
+
+    Used in compact entity mode so a changed frame costs one state write per
+    channel instead of one per field.
+    """
+
+    _unrecorded_attributes = COMPACT_UNRECORDED_ATTRIBUTES
+
+    def _depends_on(self) -> tuple[FieldKey, ...]:
+        channel = self.entity_description.channel
+        return (
+            (channel, "perKwh"),
+            *((channel, source_key) for source_key in COMPACT_ATTRIBUTES),
+            (channel, EXPIRY_KEY),
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Expose the channel's descriptor, spot price, renewables, spike and times."""
+        channel = self.entity_description.channel
+        attributes = {
+            name: self._coordinator.channel_value(channel, source_key)
+            for source_key, name in COMPACT_ATTRIBUTES.items()
+        }
+        attributes.update(super().extra_state_attributes or {})
+        return attributes
@@ -0,0 +1,194 @@
+"""Services for planning with forecasts and capturing websocket traffic."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Iterable
+from types import SimpleNamespace
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+
+from .capture import DEFAULT_CAPTURE_BACKUPS, CaptureRecord, FrameCapture, load_capture
+from .const import (
+    ATTR_BACKUPS,
+    ATTR_CHANNEL,
+    ATTR_COMPRESS,
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_CONTIGUOUS,
+    ATTR_INTERVALS,
+    ATTR_MAX_MEGABYTES,
+    ATTR_PATH,
+    ATTR_SPEED,
+    CHANNEL_CONTROLLED_LOAD,
+    CHANNEL_FEED_IN,
+    CHANNEL_GENERAL,
+    DOMAIN,
+    SERVICE_FIND_CHEAPEST_WINDOW,
+    SERVICE_REPLAY_CAPTURE,
+    SERVICE_START_CAPTURE,
+    SERVICE_STOP_CAPTURE,
+)
+from .coordinator import AmberCoordinator
+from .price_coordinator import PriceCoordinator
+from .websocket_client import AmberWebsocketClient
+
+_LOGGER = logging.getLogger(__name__)
+
+START_CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_PATH): cv.string,
+        vol.Optional(ATTR_MAX_MEGABYTES, default=10): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1)
+        ),
+        vol.Optional(ATTR_BACKUPS, default=DEFAULT_CAPTURE_BACKUPS): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=100)
+        ),
+        vol.Optional(ATTR_COMPRESS, default=False): cv.boolean,
+    }
+)
+STOP_CAPTURE_SCHEMA = vol.Schema({vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string})
+REPLAY_CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_PATH): cv.string,
+        vol.Optional(ATTR_SPEED, default=1.0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    }
+)
+FIND_CHEAPEST_WINDOW_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_INTERVALS): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(ATTR_CHANNEL, default=CHANNEL_GENERAL): vol.In(
+            [CHANNEL_GENERAL, CHANNEL_FEED_IN, CHANNEL_CONTROLLED_LOAD]
+        ),
+        vol.Optional(ATTR_CONTIGUOUS, default=True): cv.boolean,
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the capture and replay services."""
+
+    async def _start_capture(call: ServiceCall) -> None:
+        client = _client_for_call(hass, call)
+        compress = call.data[ATTR_COMPRESS]
+        path = _capture_path(hass, call, compress)
+        if client.capture is not None:
+            raise ServiceValidationError(f"Already capturing to {client.capture.path}")
+        capture = FrameCapture(
+            path,
+            max_bytes=int(call.data[ATTR_MAX_MEGABYTES] * 1024 * 1024),
+            backups=call.data[ATTR_BACKUPS],
+            compress=compress,
+        )
+        try:
+            await hass.async_add_executor_job(capture.open)
+        except OSError as err:
+            raise ServiceValidationError(f"Cannot write capture {path}: {err}") from err
+        client.start_capture(capture)
+
+    async def _stop_capture(call: ServiceCall) -> None:
+        await _client_for_call(hass, call).async_stop_capture()
+
+    async def _replay_capture(call: ServiceCall) -> None:
+        site_id = _entry_data(hass, call)["coordinator"].site_id
+        path = _capture_path(hass, call, False)
+        try:
+            records = await hass.async_add_executor_job(load_capture, path)
+        except (OSError, ValueError, KeyError) as err:
+            raise ServiceValidationError(f"Cannot read capture {path}: {err}") from err
+        # Replay into a throwaway client and coordinator: the live ones would move real
+        # sensors, fire threshold triggers, persist old prices and skew the watchdog.
+        # Replays never connect, so the client needs no real session.
+        client = AmberWebsocketClient(
+            "replay", session=SimpleNamespace(), create_task=hass.async_create_task
+        )
+        coordinator = PriceCoordinator(client, site_id)
+        # Real-time replays can run for as long as the capture did, so don't hold the call.
+        hass.async_create_task(
+            _async_replay(client, coordinator, records, call.data[ATTR_SPEED]),
+            name="Amber websocket replay",
+        )
+        _LOGGER.info("Replaying %s captured records from %s", len(records), path)
+
+    async def _find_cheapest_window(call: ServiceCall) -> ServiceResponse:
+        coordinator: AmberCoordinator = _entry_data(hass, call)["coordinator"]
+        channel = call.data[ATTR_CHANNEL]
+        forecast = coordinator.forecast(channel)
+        if forecast is None:
+            raise ServiceValidationError(f"No forecast intervals received for {channel} yet")
+        window = forecast.cheapest_window(
+            call.data[ATTR_INTERVALS], contiguous=call.data[ATTR_CONTIGUOUS], now=time.time()
+        )
+        if window is None:
+            raise ServiceValidationError(
+                f"Fewer than {call.data[ATTR_INTERVALS]} upcoming {channel} intervals are known"
+            )
+        return window
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_START_CAPTURE, _start_capture, schema=START_CAPTURE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_STOP_CAPTURE, _stop_capture, schema=STOP_CAPTURE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_REPLAY_CAPTURE, _replay_capture, schema=REPLAY_CAPTURE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FIND_CHEAPEST_WINDOW,
+        _find_cheapest_window,
+        schema=FIND_CHEAPEST_WINDOW_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+async def _async_replay(
+    client: AmberWebsocketClient,
+    coordinator: PriceCoordinator,
+    records: Iterable[CaptureRecord],
+    speed: float,
+) -> None:
+    try:
+        frames = await client.async_replay(records, speed=speed)
+        # Let the dispatcher apply the last queued frames.
+        await asyncio.sleep(0)
+    finally:
+        await coordinator.async_shutdown()
+        await client.async_stop()
+    _LOGGER.info(
+        "Replayed %s frames for site %s (%s applied, %s coalesced): %s",
+        frames,
+        coordinator.site_id,
+        coordinator.frames_applied,
+        client.metrics.coalesced_frames,
+        coordinator.channel_summaries(),
+    )
+
+
+def _entry_data(hass: HomeAssistant, call: ServiceCall) -> dict[str, Any]:
+    entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+    stored = hass.data.get(DOMAIN, {}).get(entry_id)
+    if stored is None:
+        raise ServiceValidationError(f"Amber WebSocket entry {entry_id} is not loaded")
+    return stored
+
+
+def _client_for_call(hass: HomeAssistant, call: ServiceCall) -> AmberWebsocketClient:
+    return _entry_data(hass, call)["client"]
+
+
+def _capture_path(hass: HomeAssistant, call: ServiceCall, compress: bool) -> str:
+    if ATTR_PATH not in call.data:
+        return hass.config.path(f"{DOMAIN}_capture.jsonl" + (".gz" if compress else ""))
+    path = hass.config.path(call.data[ATTR_PATH])
+    if not hass.config.is_allowed_path(path):
+        raise ServiceValidationError(f"Path {path} is not in allowlist_external_dirs")
+    return path
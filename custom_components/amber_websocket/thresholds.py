@@ -0,0 +1,148 @@
+"""Per-channel price thresholds, found by bisect when a price moves."""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable
+from typing import Any
+
+from .models import ChannelPrice
+from .price_coordinator import INVERTED_CHANNELS
+
+TRIGGER_PRICE_ABOVE = "price_above"
+TRIGGER_PRICE_BELOW = "price_below"
+TRIGGER_SPIKE_CHANGED = "spike_status_changed"
+TRIGGER_TYPES = [TRIGGER_PRICE_ABOVE, TRIGGER_PRICE_BELOW, TRIGGER_SPIKE_CHANGED]
+
+SPIKE_STATUSES = ["none", "potential", "spike"]
+
+ThresholdAction = Callable[[dict[str, Any]], None]
+# Trigger type, threshold (or new spike status) and the actions registered for it.
+Crossing = tuple[str, Any, list[ThresholdAction]]
+
+
+def threshold_price(channel: str, price: ChannelPrice) -> float | None:
+    """Return the price thresholds compare against, in Amber's own sign.
+
+    Feed-in snapshots are inverted so exports read as negative costs; thresholds
+    use the price as Amber quotes it, so "above 20" means earning more than 20c.
+    """
+    if price.per_kwh is None or channel not in INVERTED_CHANNELS:
+        return price.per_kwh
+    return -price.per_kwh
+
+
+class _SortedThresholds:
+    """Distinct thresholds kept sorted, each with the actions registered on it."""
+
+    __slots__ = ("keys", "actions")
+
+    def __init__(self) -> None:
+        self.keys: list[float] = []
+        self.actions: dict[float, dict[ThresholdAction, None]] = {}
+
+    def add(self, threshold: float, action: ThresholdAction) -> Callable[[], None]:
+        bucket = self.actions.get(threshold)
+        if bucket is None:
+            bucket = self.actions[threshold] = {}
+            self.keys.insert(bisect_left(self.keys, threshold), threshold)
+        bucket[action] = None
+
+        def _remove() -> None:
+            bucket.pop(action, None)
+            if not bucket and self.actions.get(threshold) is bucket:
+                del self.actions[threshold]
+                del self.keys[bisect_left(self.keys, threshold)]
+
+        return _remove
+
+
+class ThresholdIndex:
+    """Price thresholds and spike listeners for one site.
+
+    ``price_above`` thresholds fire when the :func:`threshold_price` moves from
+    at or below the threshold to above it, and ``price_below`` ones when it
+    moves from at or above to below. Each side is a sorted list, so a price
+    move finds the thresholds it crossed with two bisects: O(log n + k) for k
+    crossings no matter how many thresholds are registered.
+    """
+
+    def __init__(self) -> None:
+        self._above: dict[str, _SortedThresholds] = {}
+        self._below: dict[str, _SortedThresholds] = {}
+        self._spike: dict[str, dict[ThresholdAction, str | None]] = {}
+        self.registrations = 0
+
+    def __bool__(self) -> bool:
+        return self.registrations > 0
+
+    def async_add(
+        self, channel: str, trigger_type: str, value: Any, action: ThresholdAction
+    ) -> Callable[[], None]:
+        """Register ``action`` for a trigger; ``value`` is the threshold or spike status.
+
+        A ``None`` value on a spike trigger fires for every status change.
+        """
+        if trigger_type == TRIGGER_SPIKE_CHANGED:
+            listeners = self._spike.setdefault(channel, {})
+            listeners[action] = value
+
+            def _remove_inner() -> None:
+                listeners.pop(action, None)
+
+        else:
+            side = self._above if trigger_type == TRIGGER_PRICE_ABOVE else self._below
+            _remove_inner = side.setdefault(channel, _SortedThresholds()).add(
+                float(value), action
+            )
+        self.registrations += 1
+        removed = False
+
+        def _remove() -> None:
+            nonlocal removed
+            if removed:
+                return
+            removed = True
+            self.registrations -= 1
+            _remove_inner()
+
+        return _remove
+
+    def crossings(
+        self, channel: str, old: ChannelPrice | None, new: ChannelPrice | None
+    ) -> list[Crossing]:
+        """Return the triggers fired by a channel moving from ``old`` to ``new``.
+
+        Nothing fires without both snapshots, so startup never fires a trigger.
+        """
+        if old is None or new is None:
+            return []
+        fired: list[Crossing] = []
+        before, after = threshold_price(channel, old), threshold_price(channel, new)
+        if before is not None and after is not None and before != after:
+            if after > before:
+                # Above thresholds in [before, after) are crossed on the way up.
+                trigger_type = TRIGGER_PRICE_ABOVE
+                thresholds = self._above.get(channel)
+                lo, hi = bisect_left, bisect_left
+            else:
+                # Below thresholds in (after, before] are crossed on the way down.
+                trigger_type = TRIGGER_PRICE_BELOW
+                thresholds = self._below.get(channel)
+                lo, hi = bisect_right, bisect_right
+                before, after = after, before
+            if thresholds is not None:
+                keys = thresholds.keys
+                fired.extend(
+                    (trigger_type, key, list(thresholds.actions[key]))
+                    for key in keys[lo(keys, before) : hi(keys, after)]
+                )
+        listeners = self._spike.get(channel)
+        if listeners and old.spike_status != new.spike_status:
+            actions = [
+                action
+                for action, status in listeners.items()
+                if status is None or status == new.spike_status
+            ]
+            if actions:
+                fired.append((TRIGGER_SPIKE_CHANGED, new.spike_status, actions))
+        return fired
@@ -0,0 +1,196 @@
+"""Home Assistant websocket API commands for streaming Amber prices to the frontend."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    CHANNEL_CONTROLLED_LOAD,
+    CHANNEL_FEED_IN,
+    CHANNEL_GENERAL,
+    DOMAIN,
+    SIGNAL_COORDINATOR_READY,
+)
+from .coordinator import EXPIRY_KEY, AmberCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MIN_INTERVAL = 1.0
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the integration's websocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe_prices)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe_prices",
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): str,
+        vol.Optional("deltas", default=False): bool,
+        vol.Optional("min_interval", default=DEFAULT_MIN_INTERVAL): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=3600)
+        ),
+    }
+)
+@callback
+def websocket_subscribe_prices(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream compact price snapshots for one or every loaded site.
+
+    A stream ends when its coordinator shuts down, and the subscription attaches
+    to coordinators set up later, so reloads and newly added sites keep streaming.
+    """
+    entries: dict[str, dict[str, Any]] = hass.data.get(DOMAIN, {})
+    entry_id = msg.get(ATTR_CONFIG_ENTRY_ID)
+    if entry_id is not None and entry_id not in entries:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Amber WebSocket entry is not loaded"
+        )
+        return
+
+    streams: dict[_PriceStream, None] = {}
+
+    @callback
+    def _add_stream(added_entry_id: str, coordinator: AmberCoordinator) -> _PriceStream | None:
+        if entry_id is not None and added_entry_id != entry_id:
+            return None
+        stream = _PriceStream(
+            hass, connection, msg["id"], coordinator, msg["deltas"], msg["min_interval"]
+        )
+        streams[stream] = None
+        stream.on_close = lambda: streams.pop(stream, None)
+        return stream
+
+    @callback
+    def _coordinator_ready(added_entry_id: str, coordinator: AmberCoordinator) -> None:
+        if stream := _add_stream(added_entry_id, coordinator):
+            stream.send()
+
+    initial = [
+        _add_stream(stored_entry_id, stored["coordinator"])
+        for stored_entry_id, stored in entries.items()
+    ]
+    unsub_ready = async_dispatcher_connect(hass, SIGNAL_COORDINATOR_READY, _coordinator_ready)
+
+    @callback
+    def _unsubscribe() -> None:
+        unsub_ready()
+        for stream in list(streams):
+            stream.close()
+
+    connection.subscriptions[msg["id"]] = _unsubscribe
+    connection.send_result(msg["id"])
+    for stream in initial:
+        if stream is not None:
+            stream.send()
+
+
+class _PriceStream:
+    """Forward one coordinator's prices to one subscriber, at most every ``min_interval``."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connection: websocket_api.ActiveConnection,
+        msg_id: int,
+        coordinator: AmberCoordinator,
+        deltas: bool,
+        min_interval: float,
+    ) -> None:
+        self._hass = hass
+        self._connection = connection
+        self._msg_id = msg_id
+        self._coordinator = coordinator
+        self._deltas = deltas
+        self._min_interval = min_interval
+        self._sent: dict[str, dict[str, Any]] | None = None
+        self._sent_expired: list[str] = []
+        self._last_sent = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+        self.on_close: Callable[[], None] | None = None
+        self._unsubs = [
+            coordinator.async_on_shutdown(self.close),
+            coordinator.async_add_listener(self._handle_update),
+            coordinator.async_add_listener(
+                self._handle_update,
+                [
+                    (channel, EXPIRY_KEY)
+                    for channel in (CHANNEL_GENERAL, CHANNEL_FEED_IN, CHANNEL_CONTROLLED_LOAD)
+                ],
+            ),
+        ]
+
+    @callback
+    def close(self) -> None:
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs = []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self.on_close is not None:
+            self.on_close()
+            self.on_close = None
+
+    @callback
+    def _handle_update(self) -> None:
+        if self._timer is not None:
+            return
+        wait = self._last_sent + self._min_interval - time.monotonic()
+        if wait > 0:
+            self._timer = self._hass.loop.call_later(wait, self._flush)
+            return
+        self.send()
+
+    @callback
+    def _flush(self) -> None:
+        self._timer = None
+        self.send()
+
+    @callback
+    def send(self) -> None:
+        """Send a snapshot, or only the channels that changed since the last send.
+
+        Nothing is sent when no channel or expiry changed since the last message.
+        """
+        coordinator = self._coordinator
+        channels = coordinator.channel_summaries()
+        expired = sorted(channel for channel in channels if coordinator.channel_expired(channel))
+        last_update = coordinator.last_update_at()
+        event: dict[str, Any] = {
+            "site_id": coordinator.site_id,
+            "last_update": last_update.isoformat() if last_update else None,
+            "expired": expired,
+        }
+        if self._sent is not None and channels == self._sent and expired == self._sent_expired:
+            return
+        if self._deltas and self._sent is not None:
+            changed = {
+                channel: summary
+                for channel, summary in channels.items()
+                if self._sent.get(channel) != summary
+            }
+            event["type"] = "delta"
+            event["channels"] = changed
+            event["removed"] = sorted(self._sent.keys() - channels.keys())
+        else:
+            event["type"] = "snapshot"
+            event["channels"] = channels
+        self._sent = channels
+        self._sent_expired = expired
+        self._last_sent = time.monotonic()
+        self._connection.send_message(websocket_api.event_message(self._msg_id, event))
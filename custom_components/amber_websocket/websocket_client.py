@@ -1,57 +1,377 @@
-"""WebSocket client wrapper for Amber live price updates."""
+"""WebSocket client for Amber live price updates.
+
+Only needs asyncio and aiohttp, so it runs outside Home Assistant as well;
+``clients.py`` shares one instance per auth token inside Home Assistant.
+"""
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
-from collections.abc import Callable
+import random
+import time
+from collections.abc import Callable, Iterable
 from typing import Any
 
-from aiohttp import ClientError, ClientWebSocketResponse, WSMsgType
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from aiohttp import ClientError, ClientSession, ClientWebSocketResponse, WSMsgType
 
 from .const import (
-    EVENT_PRICE_UPDATE,
     MAX_RECONNECT_DELAY,
+    MIN_RECEIVE_TIMEOUT,
     MIN_RECONNECT_DELAY,
     ORIGIN_HEADER,
+    PING_INTERVAL,
+    PONG_TIMEOUT,
+    RECONNECT_WARNING_INTERVAL,
     SUBSCRIBE_SERVICE,
     WS_URL,
 )
+from .capture import (
+    RECORD_BINARY,
+    RECORD_CONNECTED,
+    RECORD_DISCONNECTED,
+    RECORD_TEXT,
+    CaptureRecord,
+    FrameCapture,
+)
+from .decoder import Frame, PayloadDecoder, get_decoder
+from .dispatch import LatestWinsQueue
+from .forecast import INTERVAL_FORECAST
+from .metrics import ClientMetrics
+from .models import _to_datetime
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class StaleConnectionError(Exception):
+    """Raised when a subscribed site stops receiving price frames."""
+
+
+class PingTimeoutError(Exception):
+    """Raised when the server does not answer a ping in time."""
+
+
+def _full_jitter(attempt: int) -> float:
+    """Return a random delay up to the exponential backoff cap for ``attempt``."""
+    return random.uniform(0, min(MAX_RECONNECT_DELAY, MIN_RECONNECT_DELAY * 2**attempt))
+
+
+TaskFactory = Callable[..., asyncio.Task]
+
+
+class _FailureLog:
+    """Warn about the first connection failure, then summarise repeats once per interval.
+
+    An outage retrying with backoff would otherwise log a warning per attempt.
+    """
+
+    def __init__(self, interval: float = RECONNECT_WARNING_INTERVAL) -> None:
+        self._interval = interval
+        self._warned_at: float | None = None
+        self._suppressed: dict[str, int] = {}
+        self._failures = 0
+
+    def failed(self, label: str, err: Exception) -> None:
+        self._failures += 1
+        now = time.monotonic()
+        if self._warned_at is not None and now - self._warned_at < self._interval:
+            self._suppressed[label] = self._suppressed.get(label, 0) + 1
+            _LOGGER.debug("Amber websocket %s: %s", label, err)
+            return
+        if self._suppressed:
+            _LOGGER.warning(
+                "Amber websocket %s: %s (%s failures since the last warning: %s)",
+                label,
+                err,
+                sum(self._suppressed.values()),
+                ", ".join(f"{count} {name}" for name, count in self._suppressed.items()),
+            )
+        else:
+            _LOGGER.warning("Amber websocket %s: %s", label, err)
+        self._warned_at = now
+        self._suppressed = {}
+
+    def recovered(self) -> None:
+        if self._failures > 1:
+            _LOGGER.info("Amber websocket recovered after %s failed attempts", self._failures)
+        self._warned_at = None
+        self._suppressed = {}
+        self._failures = 0
+
+
+class _CountingParser:
+    """Wrap aiohttp's websocket frame parser to count wire bytes and parse CPU time.
+
+    aiohttp inflates permessage-deflate frames inside this parser, so the
+    CPU time covers decompression whenever it was negotiated.
+    """
+
+    __slots__ = ("_parser", "_metrics")
+
+    def __init__(self, parser: Any, metrics: ClientMetrics) -> None:
+        self._parser = parser
+        self._metrics = metrics
+
+    def feed_data(self, data: bytes) -> Any:
+        started = time.thread_time()
+        try:
+            return self._parser.feed_data(data)
+        finally:
+            self._metrics.inflate_seconds += time.thread_time() - started
+            self._metrics.wire_bytes += len(data)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._parser, name)
+
+
+def _count_wire_bytes(ws: ClientWebSocketResponse, metrics: ClientMetrics) -> bool:
+    """Route the socket's received chunks through a :class:`_CountingParser`.
+
+    aiohttp has no public hook for bytes read off a websocket, so this wraps
+    the parser its connection protocol feeds. Returns ``False`` when the
+    internals are not where this aiohttp version is expected to keep them.
+    """
+    connection = getattr(ws, "_conn", None)
+    protocol = getattr(connection, "protocol", None)
+    parser = getattr(protocol, "_payload_parser", None)
+    if parser is None:
+        return False
+    protocol._payload_parser = _CountingParser(  # pylint: disable=protected-access
+        parser, metrics
+    )
+    return True
+
+
 class AmberWebsocketClient:
-    """Manage the Amber WebSocket lifecycle and message fan-out."""
+    """Manage one Amber WebSocket per auth token and route payloads per site."""
+
+    def __init__(
+        self,
+        auth_token: str,
+        *,
+        session: ClientSession,
+        decoder: PayloadDecoder | None = None,
+        ws_url: str = WS_URL,
+        create_task: TaskFactory | None = None,
+    ) -> None:
+        """Create a client that connects with ``session``.
 
-    def __init__(self, hass: HomeAssistant, auth_token: str, site_id: str) -> None:
-        self._hass = hass
+        ``create_task`` starts the listener and dispatcher tasks; it defaults to
+        :func:`asyncio.create_task` and is ``hass.async_create_task`` inside
+        Home Assistant so the tasks are tracked by the core.
+        """
         self._auth_token = auth_token
-        self._site_id = site_id
-        self._session = async_get_clientsession(hass)
-        self._listeners: list[Callable[[dict[str, Any]], None]] = []
+        self._decoder = decoder or get_decoder()
+        self._session = session
+        self._ws_url = ws_url
+        self._create_task = create_task or asyncio.create_task
+        self._listeners: dict[str, dict[Callable[[dict[str, Any]], None], None]] = {}
+        self._status_listeners: dict[Callable[[], None], None] = {}
+        self._site_refs: dict[str, int] = {}
+        self._stale_timeouts: dict[str, float] = {}
+        self._last_price: dict[str, float] = {}
+        self._awaiting_first_price = False
+        self._received_price = False
         self._task: asyncio.Task | None = None
+        self._dispatcher: asyncio.Task | None = None
+        self._queue = LatestWinsQueue()
         self._ws: ClientWebSocketResponse | None = None
         self._stop_event = asyncio.Event()
+        self._capture: FrameCapture | None = None
+        self._compression = 0
+        self._interval_starts: dict[str, str] = {}
+        self._ping_sequence = 0
+        self._ping_payload: bytes | None = None
+        self._ping_sent = 0.0
+        self._next_ping = 0.0
+        self.closing = False
+        self.metrics = ClientMetrics()
+        self._failure_log = _FailureLog()
+
+    @property
+    def auth_token(self) -> str:
+        """Return the token this connection authenticates with."""
+        return self._auth_token
+
+    @property
+    def site_ids(self) -> list[str]:
+        """Return the sites currently subscribed on this connection."""
+        return list(self._site_refs)
+
+    def add_listener(
+        self, site_id: str, callback: Callable[[dict[str, Any]], None]
+    ) -> Callable[[], None]:
+        """Register a callback that fires for each inbound payload for a site."""
+        self._listeners.setdefault(site_id, {})[callback] = None
+
+        def _remove() -> None:
+            listeners = self._listeners.get(site_id)
+            if listeners is not None:
+                listeners.pop(callback, None)
+                if not listeners:
+                    self._listeners.pop(site_id)
 
-    def add_listener(self, callback: Callable[[dict[str, Any]], None]) -> Callable[[], None]:
-        """Register a callback that fires for each inbound payload."""
-        self._listeners.append(callback)
+        return _remove
+
+    def add_status_listener(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Register a callback that fires when the connection opens or drops."""
+        self._status_listeners[callback] = None
 
         def _remove() -> None:
-            if callback in self._listeners:
-                self._listeners.remove(callback)
+            self._status_listeners.pop(callback, None)
 
         return _remove
 
+    def _notify_status(self) -> None:
+        for listener in tuple(self._status_listeners):
+            listener()
+
+    async def async_subscribe(self, site_id: str, *, stale_timeout: float | None = None) -> None:
+        """Take a reference on a site, subscribing and connecting as needed.
+
+        ``stale_timeout`` is how many seconds the site may go without a price
+        frame before the watchdog forces a reconnect; ``None`` or ``0`` disables it.
+        """
+        self.set_stale_timeout(site_id, stale_timeout)
+        count = self._site_refs.get(site_id, 0)
+        self._site_refs[site_id] = count + 1
+        if count == 0:
+            # The shared socket may have been up for longer than the timeout, so a
+            # late-joining site's watchdog counts from its own subscribe.
+            self._last_price[site_id] = time.monotonic()
+            if self._ws is not None and not self._ws.closed:
+                await self._send_subscription("subscribe", site_id)
+        await self.async_start()
+
+    async def async_unsubscribe(self, site_id: str) -> None:
+        """Release a site reference, closing the socket when none remain."""
+        count = self._site_refs.get(site_id, 0) - 1
+        if count > 0:
+            self._site_refs[site_id] = count
+            return
+        self._site_refs.pop(site_id, None)
+        self._stale_timeouts.pop(site_id, None)
+        self._last_price.pop(site_id, None)
+        self._queue.discard(site_id)
+        if not self._site_refs:
+            self.closing = True
+            await self.async_stop()
+            return
+        if self._ws is not None and not self._ws.closed:
+            try:
+                await self._send_subscription("unsubscribe", site_id)
+            except (ClientError, ConnectionError) as err:
+                _LOGGER.debug("Could not unsubscribe site %s: %s", site_id, err)
+
+    def set_stale_timeout(self, site_id: str, stale_timeout: float | None) -> None:
+        """Set or clear the watchdog timeout for a site."""
+        if stale_timeout:
+            self._stale_timeouts[site_id] = stale_timeout
+        else:
+            self._stale_timeouts.pop(site_id, None)
+
+    def set_compression(self, window_bits: int) -> None:
+        """Negotiate permessage-deflate with a ``window_bits`` window from the next connect.
+
+        ``0`` disables compression. Smaller windows ask the server to keep less
+        deflate state for the connection, at some cost in compression ratio.
+        """
+        self._compression = window_bits
+
+    @property
+    def compression(self) -> int:
+        """Return the permessage-deflate window bits requested, ``0`` when disabled."""
+        return self._compression
+
+    @property
+    def capture(self) -> FrameCapture | None:
+        """Return the active frame capture, if any."""
+        return self._capture
+
+    def start_capture(self, capture: FrameCapture) -> None:
+        """Start writing every received frame and connection event to ``capture``."""
+        if self._capture is not None:
+            raise RuntimeError(f"Already capturing to {self._capture.path}")
+        loop = asyncio.get_running_loop()
+        capture.start(
+            on_error=lambda err: loop.call_soon_threadsafe(self._capture_failed, capture)
+        )
+        self._capture = capture
+        _LOGGER.info("Capturing Amber websocket frames to %s", capture.path)
+
+    def _capture_failed(self, capture: FrameCapture) -> None:
+        if self._capture is capture:
+            self._capture = None
+
+    async def async_stop_capture(self) -> FrameCapture | None:
+        """Stop the active capture and wait for its writer to flush."""
+        capture, self._capture = self._capture, None
+        if capture is None:
+            return None
+        capture.stop()
+        await asyncio.get_running_loop().run_in_executor(None, capture.join)
+        _LOGGER.info(
+            "Stopped capture to %s after %s records", capture.path, capture.records_written
+        )
+        return capture
+
+    async def async_replay(
+        self, records: Iterable[CaptureRecord], *, speed: float | None = 1.0
+    ) -> int:
+        """Feed captured frames back through the normal receive path.
+
+        ``speed`` scales the captured inter-frame gaps (``1.0`` is real time);
+        ``None`` or ``0`` replays as fast as the dispatcher keeps up. Connection
+        events are replayed into the metrics and status listeners. Returns the
+        number of frames replayed.
+        """
+        self._ensure_dispatcher()
+        started = time.monotonic()
+        first_at: float | None = None
+        frames = 0
+        for record in records:
+            if speed:
+                if first_at is None:
+                    first_at = record.at
+                delay = (record.at - first_at) / speed - (time.monotonic() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            if record.kind in (RECORD_TEXT, RECORD_BINARY):
+                self._handle_message(record.data)
+                frames += 1
+            elif record.kind == RECORD_CONNECTED:
+                self.metrics.mark_connected()
+                self._awaiting_first_price = True
+                self._notify_status()
+            elif record.kind == RECORD_DISCONNECTED:
+                self.metrics.mark_disconnected(record.cause or "replay", 0.0)
+                self._notify_status()
+            # Yield so the dispatcher can apply frames the way it would live.
+            await asyncio.sleep(0)
+        _LOGGER.debug("Replayed %s frames in %.3fs", frames, time.monotonic() - started)
+        return frames
+
     async def async_start(self) -> None:
         """Begin the background task if it is not already running."""
         if self._task and not self._task.done():
             return
         self._stop_event.clear()
-        self._task = self._hass.async_create_task(self._run(), name="Amber websocket listener")
+        self._task = self._create_task(self._run(), name="Amber websocket listener")
+        self._ensure_dispatcher()
+
+    def _ensure_dispatcher(self) -> None:
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = self._create_task(
+                self._dispatch_loop(), name="Amber websocket dispatcher"
+            )
+            self._dispatcher.add_done_callback(self._dispatcher_done)
+
+    def _dispatcher_done(self, task: asyncio.Task) -> None:
+        if task.cancelled() or task is not self._dispatcher:
+            return
+        # A dead dispatcher would freeze prices while frames keep the watchdog fed.
+        _LOGGER.error("Amber websocket dispatcher stopped: %s; restarting it", task.exception())
+        self._dispatcher = None
+        self._ensure_dispatcher()
 
     async def async_stop(self) -> None:
         """Stop the background task and close the socket."""
@@ -60,52 +380,259 @@ class AmberWebsocketClient:
             await self._ws.close()
         if self._task:
             await self._task
+        if self._dispatcher:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+        await self.async_stop_capture()
 
     async def _run(self) -> None:
-        backoff = MIN_RECONNECT_DELAY
+        attempt = 0
         while not self._stop_event.is_set():
+            self._received_price = False
             try:
                 await self._connect_and_listen()
-                backoff = MIN_RECONNECT_DELAY
+                cause = "server_closed"
             except asyncio.CancelledError:
                 raise
+            except StaleConnectionError as err:
+                self._failure_log.failed("stale", err)
+                cause = "stale"
+            except PingTimeoutError as err:
+                self._failure_log.failed("ping timeout", err)
+                cause = "ping_timeout"
             except Exception as err:  # pylint: disable=broad-except
-                _LOGGER.warning("Amber websocket error: %s", err)
-                await asyncio.sleep(backoff)
-                backoff = min(backoff * 2, MAX_RECONNECT_DELAY)
+                self._failure_log.failed("error", err)
+                cause = type(err).__name__
+            if self._stop_event.is_set():
+                break
+            if self._received_price:
+                attempt = 0
+            if cause == "server_closed" and self._received_price:
+                # A clean close after a healthy session reconnects straight away.
+                delay = 0.0
+            else:
+                delay = _full_jitter(attempt)
+                attempt += 1
+            self.metrics.mark_disconnected(cause, delay)
+            if self._capture is not None:
+                self._capture.record_event(RECORD_DISCONNECTED, cause)
+            self._notify_status()
+            if delay:
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _send_subscription(self, action: str, site_id: str) -> None:
+        if self._ws is None:
+            return
+        await self._ws.send_str(
+            self._decoder.dumps(
+                {
+                    "service": SUBSCRIBE_SERVICE,
+                    "action": action,
+                    "data": {"siteId": site_id},
+                }
+            )
+        )
+        _LOGGER.debug("Sent %s for site %s", action, site_id)
 
     async def _connect_and_listen(self) -> None:
         headers = {
             "authorization": f"Bearer {self._auth_token}",
             "Origin": ORIGIN_HEADER,
         }
-        subscribe_payload = {
-            "service": SUBSCRIBE_SERVICE,
-            "action": "subscribe",
-            "data": {"siteId": self._site_id},
-        }
-        async with self._session.ws_connect(WS_URL, headers=headers, heartbeat=30) as ws:
+        # Pings are sent and pongs read here rather than by aiohttp's heartbeat,
+        # so each round trip can be timed.
+        async with self._session.ws_connect(
+            self._ws_url, headers=headers, autoping=False, compress=self._compression
+        ) as ws:
             self._ws = ws
-            _LOGGER.info("Connected to Amber websocket for site %s", self._site_id)
-            await ws.send_str(json.dumps(subscribe_payload))
-            async for msg in ws:
-                if msg.type == WSMsgType.TEXT:
-                    self._handle_message(msg.data)
-                elif msg.type == WSMsgType.ERROR:
-                    raise ClientError("Amber websocket closed with error")
-                elif msg.type in (WSMsgType.CLOSED, WSMsgType.CLOSING):
-                    break
-        self._ws = None
-
-    def _handle_message(self, payload: str) -> None:
+            self._interval_starts.clear()
+            self._ping_payload = None
+            self._next_ping = time.monotonic() + PING_INTERVAL
+            self.metrics.mark_connected()
+            self.metrics.mark_compression(ws.compress, ws.client_notakeover)
+            if not _count_wire_bytes(ws, self.metrics):
+                _LOGGER.debug("Wire byte counting is unavailable with this aiohttp version")
+            self._awaiting_first_price = True
+            if self._capture is not None:
+                self._capture.record_event(RECORD_CONNECTED)
+            self._notify_status()
+            _LOGGER.info("Connected to Amber websocket for sites %s", ", ".join(self._site_refs))
+            try:
+                for site_id in list(self._site_refs):
+                    await self._send_subscription("subscribe", site_id)
+                while True:
+                    await self._check_deadlines(ws)
+                    try:
+                        msg = await ws.receive(timeout=self._receive_timeout())
+                    except asyncio.TimeoutError:
+                        continue
+                    if msg.type in (WSMsgType.TEXT, WSMsgType.BINARY):
+                        # Amber frames are ASCII JSON, so characters equal bytes.
+                        self.metrics.payload_bytes += len(msg.data)
+                        if self._capture is not None:
+                            self._capture.record(msg.data)
+                        self._handle_message(msg.data)
+                    elif msg.type == WSMsgType.PING:
+                        await ws.pong(msg.data)
+                    elif msg.type == WSMsgType.PONG:
+                        self._handle_pong(msg.data)
+                    elif msg.type == WSMsgType.ERROR:
+                        raise ClientError("Amber websocket closed with error")
+                    elif msg.type in (WSMsgType.CLOSE, WSMsgType.CLOSED, WSMsgType.CLOSING):
+                        break
+            finally:
+                self._ws = None
+
+    def _watchdog_deadlines(self) -> dict[str, float]:
+        connected = self.metrics.connected_monotonic or time.monotonic()
+        return {
+            site_id: max(self._last_price.get(site_id, 0.0), connected) + timeout
+            for site_id, timeout in self._stale_timeouts.items()
+        }
+
+    def _watchdog_timeout(self) -> float | None:
+        deadlines = self._watchdog_deadlines()
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines.values()) - time.monotonic())
+
+    def _check_stale(self) -> None:
+        now = time.monotonic()
+        stale = [site for site, deadline in self._watchdog_deadlines().items() if deadline <= now]
+        if stale:
+            raise StaleConnectionError(f"no price frame for site(s) {', '.join(stale)}")
+
+    def _receive_timeout(self) -> float:
+        """Return how long to wait for a frame before a ping, pong or watchdog deadline."""
+        if self._ping_payload is not None:
+            deadline = self._ping_sent + PONG_TIMEOUT
+        else:
+            deadline = self._next_ping
+        timeout = deadline - time.monotonic()
+        watchdog = self._watchdog_timeout()
+        if watchdog is not None:
+            timeout = min(timeout, watchdog)
+        # aiohttp treats a zero receive timeout as no timeout at all, which would
+        # block until the next frame with a deadline already due.
+        return max(MIN_RECEIVE_TIMEOUT, timeout)
+
+    async def _check_deadlines(self, ws: ClientWebSocketResponse) -> None:
+        self._check_stale()
+        now = time.monotonic()
+        if self._ping_payload is not None:
+            if now - self._ping_sent >= PONG_TIMEOUT:
+                self.metrics.ping_timeouts += 1
+                raise PingTimeoutError(f"no pong within {PONG_TIMEOUT}s")
+        elif now >= self._next_ping:
+            self._ping_sequence += 1
+            self._ping_payload = self._ping_sequence.to_bytes(8, "big")
+            self._ping_sent = now
+            await ws.ping(self._ping_payload)
+
+    def _handle_pong(self, data: bytes) -> None:
+        if data != self._ping_payload:
+            # Unsolicited or late pong for an earlier ping.
+            return
+        self.metrics.ping_rtt_ms.record((time.monotonic() - self._ping_sent) * 1000)
+        self._ping_payload = None
+        self._next_ping = self._ping_sent + PING_INTERVAL
+
+    def _record_feed_lag(self, site_id: str, data: dict[str, Any]) -> None:
+        """Sample how long after its interval began a site's new interval price arrived.
+
+        Only moves to a later interval are sampled, and not the first interval
+        seen on a connection, which may have started long before the socket opened.
+        """
+        body = data.get("data")
+        prices = body.get("prices") if isinstance(body, dict) else None
+        if not prices:
+            return
+        start = next(
+            (price.get("startTime") for price in prices if price.get("type") != INTERVAL_FORECAST),
+            None,
+        )
+        previous = self._interval_starts.get(site_id)
+        # Amber's ISO timestamps share one format, so they order as strings.
+        if start is None or (previous is not None and start <= previous):
+            return
+        self._interval_starts[site_id] = start
+        started_at = _to_datetime(start)
+        received_at = self.metrics.last_frame_at
+        if previous is None or started_at is None or received_at is None:
+            return
+        self.metrics.feed_lag_s.record(max(0.0, received_at - started_at.timestamp()))
+
+    def _route(self, data: dict[str, Any]) -> str | None:
+        body = data.get("data")
+        site_id = body.get("siteId") if isinstance(body, dict) else None
+        if site_id is None and len(self._site_refs) == 1:
+            # Single-site connections may receive payloads without a siteId.
+            site_id = next(iter(self._site_refs))
+        return site_id
+
+    def _handle_message(self, payload: Frame) -> None:
+        metrics = self.metrics
+        metrics.mark_frame()
+        started = time.perf_counter()
         try:
-            data = json.loads(payload)
-        except json.JSONDecodeError:
+            data = self._decoder.loads(payload)
+        except self._decoder.errors:
+            metrics.decode_failures += 1
             _LOGGER.debug("Received non-JSON payload: %s", payload)
             return
-        self._hass.bus.async_fire(
-            EVENT_PRICE_UPDATE,
-            {"site_id": self._site_id, "payload": data},
-        )
-        for callback in list(self._listeners):
-            callback(data)
+        decoded = time.perf_counter()
+        metrics.decode_ms.record((decoded - started) * 1000)
+        if not isinstance(data, dict):
+            _LOGGER.debug("Ignoring unexpected payload: %s", payload)
+            return
+        site_id = self._route(data)
+        if site_id is None or site_id not in self._listeners:
+            _LOGGER.debug("No listeners for payload site %s", site_id)
+            return
+        now = time.monotonic()
+        self._last_price[site_id] = now
+        self._received_price = True
+        if self._ws is not None:
+            self._record_feed_lag(site_id, data)
+        if self._awaiting_first_price and metrics.connected_monotonic is not None:
+            self._awaiting_first_price = False
+            self._failure_log.recovered()
+            metrics.first_price_ms.record((now - metrics.connected_monotonic) * 1000)
+        if self._queue.put(site_id, (data, decoded)):
+            metrics.coalesced_frames += 1
+        depth = len(self._queue)
+        if depth > metrics.max_queue_depth:
+            metrics.max_queue_depth = depth
+
+    async def _dispatch_loop(self) -> None:
+        """Apply the newest queued payload per site, off the socket read path."""
+        while True:
+            batch = await self._queue.get_batch()
+            for site_id, (data, queued) in batch.items():
+                self._dispatch(site_id, data, queued)
+
+    def _dispatch(self, site_id: str, data: dict[str, Any], queued: float) -> None:
+        listeners = self._listeners.get(site_id)
+        if not listeners:
+            return
+        metrics = self.metrics
+        started = time.perf_counter()
+        metrics.queue_ms.record((started - queued) * 1000)
+        for listener in tuple(listeners):
+            try:
+                listener(data)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error applying Amber payload for site %s", site_id)
+        metrics.fanout_ms.record((time.perf_counter() - started) * 1000)
+
+    @property
+    def queue_depth(self) -> int:
+        """Return how many sites have a payload waiting to be applied."""
+        return len(self._queue)
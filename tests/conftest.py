@@ -0,0 +1,46 @@
+"""Shared fixtures for the Amber WebSocket tests.
+
+Run from the repository root with Home Assistant installed::
+
+    python -m pytest tests
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+
+class FakeClient:
+    """Stand-in websocket client that never connects."""
+
+    def add_listener(self, site_id: str, callback: Callable[[dict[str, Any]], None]):
+        return lambda: None
+
+    def add_status_listener(self, callback: Callable[[], None]):
+        return lambda: None
+
+
+@pytest.fixture
+def fake_client() -> FakeClient:
+    return FakeClient()
+
+
+@pytest.fixture
+def run_with_hass(tmp_path) -> Callable[[Callable[[HomeAssistant], Awaitable[Any]]], Any]:
+    """Run an async scenario against a bare Home Assistant instance."""
+
+    def _run(scenario: Callable[[HomeAssistant], Awaitable[Any]]) -> Any:
+        async def _main() -> Any:
+            hass = HomeAssistant(str(tmp_path))
+            try:
+                return await scenario(hass)
+            finally:
+                await hass.async_stop(force=True)
+
+        return asyncio.run(_main())
+
+    return _run
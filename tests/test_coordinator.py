@@ -0,0 +1,119 @@
+"""Tests for the Home Assistant coordinator."""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from benchmarks.payloads import price_entry, price_payload
+from custom_components.amber_websocket.const import EVENT_MODE_CHANGES, EVENT_PRICE_UPDATE
+from custom_components.amber_websocket.coordinator import AmberCoordinator
+from custom_components.amber_websocket.price_coordinator import HISTORY_KEY
+
+SITE_ID = "01BENCHMARKSITE0000000000"
+
+
+class FakeStore:
+    """In-memory stand-in for a Home Assistant ``Store``."""
+
+    def __init__(self, data: dict[str, Any] | None = None) -> None:
+        self.data = data
+
+    async def async_load(self) -> dict[str, Any] | None:
+        return self.data
+
+    def async_delay_save(self, data_func, delay: float = 0) -> None:
+        self.data = data_func()
+
+
+def _payload(start, per_kwh: float) -> dict[str, Any]:
+    return {"data": {"siteId": SITE_ID, "prices": [price_entry("general", start, per_kwh)]}}
+
+
+def test_first_live_frame_clears_restored_marker_everywhere(run_with_hass, fake_client) -> None:
+    """Listeners whose own figures did not change still hear about the first live frame."""
+    start = dt_util.utcnow() - timedelta(minutes=1)
+
+    async def scenario(hass):
+        store = FakeStore(
+            {"payload": _payload(start, 20), "received_at": dt_util.utcnow().isoformat()}
+        )
+        coordinator = AmberCoordinator(hass, fake_client, SITE_ID, store=store)
+        await coordinator.async_restore()
+        assert coordinator.restored
+        woken = []
+        coordinator.async_add_listener(
+            lambda: woken.append(coordinator.restored), [("general", HISTORY_KEY)]
+        )
+        # Same interval and price, so the rolling history does not change.
+        coordinator._handle_payload(_payload(start, 20))
+        await coordinator.async_shutdown()
+        return woken
+
+    assert run_with_hass(scenario) == [False]
+
+
+def test_repeated_frame_with_forecasts_fires_no_event(run_with_hass, fake_client) -> None:
+    """An identical frame, forecasts included, changes nothing in ``changes`` mode."""
+
+    async def scenario(hass):
+        coordinator = AmberCoordinator(
+            hass, fake_client, SITE_ID, event_mode=EVENT_MODE_CHANGES
+        )
+        events = []
+        hass.bus.async_listen(EVENT_PRICE_UPDATE, events.append)
+        payload = price_payload(forecasts=12)
+        coordinator._handle_payload(payload)
+        await hass.async_block_till_done()
+        fired = len(events)
+        coordinator._handle_payload(price_payload(forecasts=12))
+        await hass.async_block_till_done()
+        await coordinator.async_shutdown()
+        return fired, len(events), coordinator.event_counts()["suppressed"]
+
+    assert run_with_hass(scenario) == (1, 1, 1)
+
+
+def test_restored_ended_interval_is_not_expired(run_with_hass, fake_client) -> None:
+    """A restart after the interval ended keeps the restored price available."""
+    start = dt_util.utcnow() - timedelta(hours=2)
+
+    async def scenario(hass):
+        store = FakeStore({"payload": _payload(start, 20), "received_at": start.isoformat()})
+        coordinator = AmberCoordinator(hass, fake_client, SITE_ID, store=store)
+        await coordinator.async_restore()
+        restored = coordinator.channel_expired("general"), coordinator.restored
+        # A live frame for the same ended interval expires it as usual.
+        coordinator._handle_payload(_payload(start, 20))
+        live = coordinator.channel_expired("general")
+        await coordinator.async_shutdown()
+        return restored, live
+
+    assert run_with_hass(scenario) == ((False, True), True)
+
+
+def test_saves_are_not_postponed_by_later_frames(run_with_hass, fake_client) -> None:
+    """Frames arriving within the save delay do not push the pending write back."""
+
+    class RecordingStore(FakeStore):
+        def __init__(self) -> None:
+            super().__init__()
+            self.scheduled = []
+
+        def async_delay_save(self, data_func, delay: float = 0) -> None:
+            self.scheduled.append(data_func)
+
+    async def scenario(hass):
+        store = RecordingStore()
+        coordinator = AmberCoordinator(hass, fake_client, SITE_ID, store=store)
+        for sequence in range(3):
+            coordinator._handle_payload(price_payload(sequence))
+        pending = len(store.scheduled)
+        # The delayed write collects the latest frame, and the next frame schedules again.
+        latest = store.scheduled[0]()["payload"] is coordinator.data
+        coordinator._handle_payload(price_payload(3))
+        await coordinator.async_shutdown()
+        return pending, latest, len(store.scheduled)
+
+    assert run_with_hass(scenario) == (1, True, 2)
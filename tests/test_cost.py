@@ -0,0 +1,44 @@
+"""Tests for the running cost helpers."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.amber_websocket.cost import (
+    RESET_DAILY,
+    RESET_MONTHLY,
+    RESET_WEEKLY,
+    cycle_start,
+)
+
+
+@pytest.fixture
+def brisbane():
+    default = dt_util.DEFAULT_TIME_ZONE
+    dt_util.set_default_time_zone(dt_util.get_time_zone("Australia/Brisbane"))
+    yield dt_util.DEFAULT_TIME_ZONE
+    dt_util.set_default_time_zone(default)
+
+
+@pytest.mark.parametrize(
+    ("cycle", "expected"),
+    [
+        (RESET_DAILY, datetime(2026, 10, 18)),
+        # 2026-10-18 is a Sunday; weeks start on Monday.
+        (RESET_WEEKLY, datetime(2026, 10, 12)),
+        (RESET_MONTHLY, datetime(2026, 10, 1)),
+    ],
+)
+def test_cycle_start_uses_local_date(brisbane, cycle, expected) -> None:
+    """A UTC time early on the local morning resolves to the local day."""
+    # 05:00 on the 18th in Brisbane is still the 17th in UTC.
+    now = datetime(2026, 10, 17, 19, 0, tzinfo=timezone.utc)
+    assert cycle_start(now, cycle) == expected.replace(tzinfo=brisbane)
+
+
+def test_cycle_start_monday_morning(brisbane) -> None:
+    """Monday before 10:00 local starts the new week, not the previous one."""
+    now = datetime(2026, 10, 18, 20, 0, tzinfo=timezone.utc)
+    assert cycle_start(now, RESET_WEEKLY) == datetime(2026, 10, 19, tzinfo=brisbane)
@@ -0,0 +1,35 @@
+"""Tests for the forecast cheapest-window search."""
+from __future__ import annotations
+
+from custom_components.amber_websocket.forecast import ChannelForecast
+
+# 0-600 and 900-1800 in 5-minute intervals, with no interval for 600-900.
+ROWS = [(0, 300, 5.0), (300, 600, 1.0), (900, 1200, 1.0), (1200, 1500, 9.0), (1500, 1800, 2.0)]
+
+
+def _starts(window) -> list[str]:
+    return [interval["start"][11:19] for interval in window["intervals"]]
+
+
+def test_contiguous_window_does_not_span_a_gap() -> None:
+    """The two 1c intervals either side of the gap are not a contiguous block."""
+    forecast = ChannelForecast("general", ROWS)
+    window = forecast.cheapest_window(2, contiguous=True, now=0)
+    assert _starts(window) == ["00:00:00", "00:05:00"]
+    assert window["total_per_kwh"] == 6.0
+
+    later = forecast.cheapest_window(2, contiguous=True, now=300)
+    assert _starts(later) == ["00:15:00", "00:20:00"]
+
+    spread = forecast.cheapest_window(2, contiguous=False, now=0)
+    assert _starts(spread) == ["00:05:00", "00:15:00"]
+    assert spread["average_per_kwh"] == 1.0
+
+
+def test_more_intervals_than_known_returns_none() -> None:
+    """Asking for more intervals than remain finds no window."""
+    forecast = ChannelForecast("general", ROWS)
+    assert forecast.cheapest_window(6, contiguous=True, now=0) is None
+    assert forecast.cheapest_window(6, contiguous=False, now=0) is None
+    assert forecast.cheapest_window(4, contiguous=False, now=300) is not None
+    assert forecast.cheapest_window(5, contiguous=False, now=300) is None
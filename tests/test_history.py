@@ -0,0 +1,36 @@
+"""Tests for the rolling price history."""
+from __future__ import annotations
+
+from custom_components.amber_websocket.history import STAT_MAX, STAT_MEAN, STAT_MIN, PriceHistory
+
+INTERVAL = 300.0
+
+
+def _stats(history: PriceHistory, window: str) -> tuple[float | None, ...]:
+    return tuple(history.stat("perKwh", window, stat) for stat in (STAT_MEAN, STAT_MIN, STAT_MAX))
+
+
+def test_capacity_wrap_evicts_oldest_and_skips_nan() -> None:
+    """Slots overwritten by the ring leave every window; missing prices never count."""
+    history = PriceHistory(capacity=4)
+    # 99 and 1 are overwritten once the ring wraps; None is held as NaN.
+    for index, price in enumerate([99, None, 1, 5, 40, 20, None, 15]):
+        history.add(index * INTERVAL, {"perKwh": price, "renewables": None})
+
+    assert len(history) == 5
+    assert _stats(history, "1h") == (20.0, 5.0, 40.0)
+    assert _stats(history, "24h") == (20.0, 5.0, 40.0)
+    assert history.stat("renewables", "24h", STAT_MEAN) is None
+
+
+def test_time_gap_evicts_short_window_only() -> None:
+    """A jump past the 1h span empties it while the 24h window keeps the ring."""
+    history = PriceHistory(capacity=4)
+    for index, price in enumerate([99, None, 1, 5, 40, 20, None, 15]):
+        history.add(index * INTERVAL, {"perKwh": price, "renewables": None})
+    # Committing 15 wraps the ring again and drops 5.
+    history.add(10000.0, {"perKwh": 7, "renewables": None})
+
+    assert _stats(history, "1h") == (7.0, 7.0, 7.0)
+    assert _stats(history, "24h") == (20.5, 7.0, 40.0)
+    assert [row[1] for row in history.entries()] == [40.0, 20.0, None, 15.0, 7.0]
@@ -0,0 +1,29 @@
+"""Tests for the parsed price snapshots."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.payloads import price_entry
+from custom_components.amber_websocket.models import ChannelPrice
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def test_unchanged_interval_times_reuse_previous_datetimes() -> None:
+    """Same interval strings reuse parsed times; a new interval parses again."""
+    first = ChannelPrice.from_payload("general", price_entry("general", START, 20))
+    same = ChannelPrice.from_payload(
+        "general", price_entry("general", START, 25), previous=first
+    )
+    assert same.start_time is first.start_time
+    assert same.nem_time is first.nem_time
+    assert same.per_kwh == 25
+    assert same == ChannelPrice.from_payload("general", price_entry("general", START, 25))
+
+    later = START + timedelta(minutes=5)
+    moved = ChannelPrice.from_payload(
+        "general", price_entry("general", later, 25), previous=same
+    )
+    assert moved.start_time == later
+    assert moved.end_time == later + timedelta(minutes=5)
+    assert moved.changed_fields(same) == ["startTime", "endTime", "nemTime"]
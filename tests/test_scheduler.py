@@ -0,0 +1,54 @@
+"""Tests for the shared expiry scheduler."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.amber_websocket.scheduler import ExpiryScheduler
+
+
+def test_reschedule_armed_key_later_rearms_at_next_deadline(run_with_hass) -> None:
+    """Moving the armed deadline later arms the next one instead of waking early."""
+
+    async def scenario(hass):
+        scheduler = ExpiryScheduler(hass)
+        base = dt_util.utcnow().replace(microsecond=0) + timedelta(hours=1)
+        fired = []
+        scheduler.async_schedule("a", base, lambda: fired.append("a"))
+        scheduler.async_schedule("b", base + timedelta(seconds=20), lambda: fired.append("b"))
+        armed = [scheduler._armed_at]
+        scheduler.async_schedule("a", base + timedelta(seconds=30), lambda: fired.append("a"))
+        armed.append(scheduler._armed_at)
+        scheduler._async_fire(base + timedelta(seconds=20))
+        scheduler._async_fire(base + timedelta(seconds=30))
+        return armed, fired, scheduler.wakeups, scheduler._armed_at
+
+    armed, fired, wakeups, armed_after = run_with_hass(scenario)
+    assert armed[1] - armed[0] == 20
+    assert fired == ["b", "a"]
+    assert wakeups == 2
+    assert armed_after is None
+
+
+def test_cancel_armed_key_skips_its_action(run_with_hass) -> None:
+    """A cancelled armed deadline never runs, and later deadlines still fire."""
+
+    async def scenario(hass):
+        scheduler = ExpiryScheduler(hass)
+        base = dt_util.utcnow().replace(microsecond=0) + timedelta(hours=1)
+        fired = []
+        scheduler.async_schedule("a", base, lambda: fired.append("a"))
+        scheduler.async_schedule("b", base + timedelta(seconds=30), lambda: fired.append("b"))
+        scheduler.async_cancel("a")
+        # The timer armed for "a" may still wake; it must find nothing due.
+        scheduler._async_fire(base)
+        after_a = (list(fired), scheduler._armed_at - base.timestamp())
+        scheduler._async_fire(base + timedelta(seconds=30))
+        scheduler.async_cancel("b")
+        return after_a, fired, len(scheduler)
+
+    after_a, fired, pending = run_with_hass(scenario)
+    assert after_a == ([], 30)
+    assert fired == ["b"]
+    assert pending == 0
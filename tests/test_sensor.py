@@ -0,0 +1,53 @@
+"""Tests for the sensor platform."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from custom_components.amber_websocket.const import CONF_CHANNEL_FEED_IN, CONF_SITE_ID, DOMAIN
+from custom_components.amber_websocket.coordinator import AmberCoordinator
+from custom_components.amber_websocket.sensor import (
+    _build_sensor,
+    _enabled_descriptions,
+    async_apply_channel_options,
+)
+
+SITE_ID = "01TESTSITE"
+
+
+def test_disable_channel_with_registry_disabled_sensor(run_with_hass, fake_client) -> None:
+    """Turning off a channel skips removing sensors that were never added."""
+
+    async def scenario(hass):
+        coordinator = AmberCoordinator(hass, fake_client, SITE_ID)
+        entry = SimpleNamespace(entry_id="entry", data={CONF_SITE_ID: SITE_ID}, options={})
+        sensors = {
+            description.key: _build_sensor(coordinator, entry, description)
+            for description in _enabled_descriptions(entry)
+        }
+        removed = []
+        added_price = sensors["feed_in_per_kwh"]
+        added_price.hass = hass
+
+        async def _remove() -> None:
+            removed.append(added_price.entity_description.key)
+
+        added_price.async_remove = _remove
+        # History sensors default to registry-disabled, so the platform never adds them.
+        disabled = sensors["feed_in_per_kwh_1h_avg"]
+        assert disabled.hass is None
+
+        hass.data[DOMAIN] = {
+            entry.entry_id: {
+                "coordinator": coordinator,
+                "sensors": sensors,
+                "add_entities": lambda entities: None,
+            }
+        }
+        entry.options = {CONF_CHANNEL_FEED_IN: False}
+        await async_apply_channel_options(hass, entry)
+        return removed, sensors
+
+    removed, sensors = run_with_hass(scenario)
+    assert removed == ["feed_in_per_kwh"]
+    assert not [key for key in sensors if key.startswith("feed_in")]
+    assert "general_per_kwh" in sensors
@@ -0,0 +1,43 @@
+"""Tests for the integration services."""
+from __future__ import annotations
+
+import logging
+
+from benchmarks.payloads import encoded_payload
+from custom_components.amber_websocket.capture import RECORD_CONNECTED, FrameCapture
+from custom_components.amber_websocket.const import DOMAIN, SERVICE_REPLAY_CAPTURE
+from custom_components.amber_websocket.coordinator import AmberCoordinator
+from custom_components.amber_websocket.services import async_setup_services
+
+SITE_ID = "01BENCHMARKSITE0000000000"
+
+
+def test_replay_leaves_live_entry_untouched(run_with_hass, fake_client, tmp_path, caplog) -> None:
+    """Replayed frames go through a separate coordinator, not the live one."""
+    path = tmp_path / "capture.jsonl"
+    capture = FrameCapture(str(path))
+    capture.open()
+    capture.start()
+    capture.record_event(RECORD_CONNECTED)
+    capture.record(encoded_payload(0))
+    capture.stop()
+    capture.join()
+
+    async def scenario(hass):
+        hass.config.allowlist_external_dirs.add(str(tmp_path))
+        live = AmberCoordinator(hass, fake_client, SITE_ID)
+        hass.data[DOMAIN] = {"entry": {"client": fake_client, "coordinator": live}}
+        async_setup_services(hass)
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_REPLAY_CAPTURE,
+            {"config_entry_id": "entry", "path": str(path), "speed": 0},
+            blocking=True,
+        )
+        await hass.async_block_till_done()
+        await live.async_shutdown()
+        return live.frames_applied, live.channel_summaries()
+
+    with caplog.at_level(logging.INFO):
+        assert run_with_hass(scenario) == (0, {})
+    assert f"Replayed 1 frames for site {SITE_ID} (1 applied" in caplog.text
@@ -0,0 +1,32 @@
+"""Tests for the threshold index."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from benchmarks.payloads import price_entry
+from custom_components.amber_websocket.models import ChannelPrice
+from custom_components.amber_websocket.thresholds import (
+    TRIGGER_PRICE_ABOVE,
+    TRIGGER_PRICE_BELOW,
+    ThresholdIndex,
+)
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _feed_in(per_kwh: float) -> ChannelPrice:
+    return ChannelPrice.from_payload(
+        "feedIn", price_entry("feedIn", START, per_kwh), invert_price=True
+    )
+
+
+def test_feed_in_thresholds_use_amber_sign() -> None:
+    """Feed-in earnings rising past 20c fire "above 20", though the sensor falls."""
+    index = ThresholdIndex()
+    fired = []
+    index.async_add("feedIn", TRIGGER_PRICE_ABOVE, 20, fired.append)
+    index.async_add("feedIn", TRIGGER_PRICE_BELOW, -20, fired.append)
+    crossings = index.crossings("feedIn", _feed_in(15), _feed_in(25))
+    assert [(trigger_type, value) for trigger_type, value, _ in crossings] == [
+        (TRIGGER_PRICE_ABOVE, 20.0)
+    ]
@@ -0,0 +1,59 @@
+"""Tests for the websocket API price subscription."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from benchmarks.payloads import price_payload
+from custom_components.amber_websocket.const import DOMAIN, SIGNAL_COORDINATOR_READY
+from custom_components.amber_websocket.coordinator import AmberCoordinator
+from custom_components.amber_websocket.websocket_api import websocket_subscribe_prices
+
+SITE_ID = "01BENCHMARKSITE0000000000"
+
+
+class FakeConnection:
+    """Collect the events a subscription sends."""
+
+    def __init__(self) -> None:
+        self.subscriptions: dict[int, Any] = {}
+        self.events: list[dict[str, Any]] = []
+
+    def send_result(self, msg_id: int, result: Any = None) -> None:
+        pass
+
+    def send_error(self, msg_id: int, code: str, message: str) -> None:
+        raise AssertionError(message)
+
+    def send_message(self, message: dict[str, Any]) -> None:
+        self.events.append(message["event"])
+
+
+def test_subscription_follows_entry_reload(run_with_hass, fake_client) -> None:
+    """A reloaded entry's new coordinator streams to the open subscription."""
+
+    async def scenario(hass):
+        old = AmberCoordinator(hass, fake_client, SITE_ID)
+        hass.data[DOMAIN] = {"entry": {"coordinator": old}}
+        connection = FakeConnection()
+        websocket_subscribe_prices(
+            hass,
+            connection,
+            {"id": 1, "config_entry_id": "entry", "deltas": False, "min_interval": 0},
+        )
+        old._handle_payload(price_payload(0))
+        await old.async_shutdown()
+        # The old coordinator keeps no reference to the closed stream.
+        listeners = len(old._listeners)
+        new = AmberCoordinator(hass, fake_client, SITE_ID)
+        hass.data[DOMAIN]["entry"] = {"coordinator": new}
+        async_dispatcher_send(hass, SIGNAL_COORDINATOR_READY, "entry", new)
+        new._handle_payload(price_payload(1))
+        connection.subscriptions[1]()
+        await new.async_shutdown()
+        sent = [bool(event["channels"]) for event in connection.events]
+        return listeners, len(new._listeners), sent
+
+    # Each coordinator first sends its empty snapshot, then the frame it applied.
+    assert run_with_hass(scenario) == (0, 0, [False, True, False, True])
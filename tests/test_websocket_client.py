@@ -0,0 +1,46 @@
+"""Tests for the shared websocket client."""
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from custom_components.amber_websocket.websocket_client import AmberWebsocketClient
+
+
+class FakeSocket:
+    """Open socket that accepts subscription messages."""
+
+    closed = False
+
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+
+    async def send_str(self, data: str) -> None:
+        self.sent.append(data)
+
+
+def test_late_joining_site_is_not_stale() -> None:
+    """A site subscribing on a long-open socket gets a full watchdog timeout."""
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+
+        def _create_task(coro, name=None):
+            # Keep the listener and dispatcher from running; report them as alive.
+            coro.close()
+            return loop.create_future()
+
+        client = AmberWebsocketClient("token", session=SimpleNamespace(), create_task=_create_task)
+        await client.async_subscribe("A", stale_timeout=60)
+        client._ws = FakeSocket()
+        # Site A has been receiving prices on a socket that opened an hour ago.
+        client.metrics.connected_monotonic = time.monotonic() - 3600
+        client._last_price["A"] = time.monotonic()
+        await client.async_subscribe("B", stale_timeout=60)
+        client._check_stale()
+        return len(client._ws.sent), client._watchdog_timeout()
+
+    sent, timeout = asyncio.run(scenario())
+    assert sent == 1
+    assert 59 < timeout <= 60